@@ -1,5 +1,7 @@
 from dataclasses import dataclass
+from pathlib import Path
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
 from config.settings import BASE_DIR, settings
 from services.theme import get_theme_css_path, get_active_theme
 from services.corner_style import get_active_corner_style, get_corner_styles_css_version
@@ -36,6 +38,26 @@ templates = Jinja2Templates(BASE_DIR / "templates")
 # always-escape behavior explicitly.
 templates.env.autoescape = True
 
+# Outside of development the templates only change when WebZFS is upgraded,
+# which restarts the service. Skip Jinja's per-render mtime check, keep every
+# compiled template in an unbounded in-memory cache (cache_size=-1), and
+# persist compiled bytecode so restarted workers do not re-parse templates.
+# Bytecode entries are keyed by a checksum of the template source, so stale
+# entries are never used after an upgrade.
+JINJA_BYTECODE_CACHE_DIR = Path.home() / ".cache" / "webzfs" / "jinja"
+
+if not settings.DEBUG:
+    templates.env.auto_reload = False
+    templates.env.cache = {}
+    try:
+        JINJA_BYTECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        templates.env.bytecode_cache = FileSystemBytecodeCache(
+            str(JINJA_BYTECODE_CACHE_DIR)
+        )
+    except OSError:
+        # Rendering still works without a persistent bytecode cache
+        pass
+
 templates.env.globals["settings"] = settings
 templates.env.globals["NAV_TABS"] = NAV_TABS
 templates.env.globals["get_theme_css_path"] = get_theme_css_path
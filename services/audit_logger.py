@@ -3,10 +3,12 @@ Audit Logger Service
 Provides centralized logging for authentication, ZFS operations, and file access.
 Logs are stored in ~/.config/webzfs/logs/
 """
+import atexit
 import logging
 import os
+import queue
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from typing import Optional, Dict, Any
 from enum import Enum
@@ -49,10 +51,14 @@ class AuditLogger:
         
         # Create loggers for each category
         self.loggers: Dict[LogCategory, logging.Logger] = {}
+        self._listeners: list[QueueListener] = []
         
         for category in LogCategory:
             self.loggers[category] = self._create_logger(category)
         
+        # Drain any queued records to disk on interpreter shutdown
+        atexit.register(self._stop_listeners)
+        
         AuditLogger._initialized = True
     
     def _create_logger(self, category: LogCategory) -> logging.Logger:
@@ -89,13 +95,29 @@ class AuditLogger:
         )
         handler.setFormatter(formatter)
         
-        logger.addHandler(handler)
+        # The logger only enqueues records; a listener thread owns the file
+        # handle and does the writes and rotation, so log calls made on the
+        # request path never wait on disk I/O.
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, handler)
+        listener.start()
+        self._listeners.append(listener)
+        
+        logger.addHandler(QueueHandler(log_queue))
         
         # Prevent propagation to root logger
         logger.propagate = False
         
         return logger
     
+    def _stop_listeners(self) -> None:
+        """Flush queued log records and stop the writer threads"""
+        for listener in self._listeners:
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+        self._listeners.clear()
+    
     def _format_details(self, details: Dict[str, Any]) -> str:
         """
         Format details dictionary into a log string.
@@ -8,6 +8,13 @@ from email.mime.multipart import MIMEMultipart
 from typing import Optional, Dict, Any
 from datetime import datetime
 import os
+import threading
+
+# Emails sent over one SMTP connection before it is replaced
+SMTP_MAX_MESSAGES_PER_CONNECTION = 100
+
+# Seconds any single SMTP socket operation may block before failing
+SMTP_TIMEOUT = 10
 
 
 class EmailNotificationService:
@@ -25,6 +32,11 @@ class EmailNotificationService:
         self.notification_recipients = os.getenv('NOTIFICATION_RECIPIENTS', '').split(',')
         # Filter out empty strings from recipients list
         self.notification_recipients = [r.strip() for r in self.notification_recipients if r.strip()]
+        
+        # Open, logged-in SMTP connection reused across emails
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._smtp_sent = 0
+        self._smtp_lock = threading.Lock()
     
     def is_configured(self) -> bool:
         """
@@ -132,8 +144,14 @@ class EmailNotificationService:
         """
         Test email configuration by sending a test email
         
+        Unlike the job notifications, a failed send is raised rather than
+        returned, so the caller can report the actual SMTP error.
+        
         Returns:
             Dict with status and details
+            
+        Raises:
+            smtplib.SMTPException, OSError: If sending the test email fails
         """
         if not self.is_configured():
             return {
@@ -161,7 +179,7 @@ Sent at: {}
             datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         )
         
-        return self._send_email(subject, body, 'test')
+        return self._send_email(subject, body, 'test', raise_errors=True)
     
     def _format_failure_email(
         self,
@@ -228,7 +246,8 @@ This is an automated message from the ZFS Web UI.
         self,
         subject: str,
         body: str,
-        notification_type: str
+        notification_type: str,
+        raise_errors: bool = False
     ) -> Dict[str, Any]:
         """
         Send email using SMTP
@@ -237,6 +256,8 @@ This is an automated message from the ZFS Web UI.
             subject: Email subject
             body: Email body
             notification_type: Type of notification (failure/success/test)
+            raise_errors: Raise send failures instead of returning a
+                'failed' result
             
         Returns:
             Dict with status and details
@@ -251,20 +272,16 @@ This is an automated message from the ZFS Web UI.
             # Add body
             msg.attach(MIMEText(body, 'plain'))
             
-            # Connect to SMTP server
-            if self.smtp_use_tls:
-                server = smtplib.SMTP(self.smtp_host, self.smtp_port)
-                server.starttls()
-            else:
-                server = smtplib.SMTP(self.smtp_host, self.smtp_port)
-            
-            # Login if credentials provided
-            if self.smtp_user and self.smtp_password:
-                server.login(self.smtp_user, self.smtp_password)
-            
-            # Send email
-            server.send_message(msg)
-            server.quit()
+            # Send email over the shared connection, dropping it on failure
+            # so the next email starts with a fresh one
+            with self._smtp_lock:
+                server = self._get_smtp_connection()
+                try:
+                    server.send_message(msg)
+                except Exception:
+                    self._close_smtp_connection()
+                    raise
+                self._smtp_sent += 1
             
             return {
                 'status': 'sent',
@@ -273,12 +290,57 @@ This is an automated message from the ZFS Web UI.
             }
             
         except Exception as e:
+            if raise_errors:
+                raise
             return {
                 'status': 'failed',
                 'message': f'Failed to send email: {str(e)}',
                 'error': str(e)
             }
     
+    def _get_smtp_connection(self) -> smtplib.SMTP:
+        """
+        Return the open SMTP connection, connecting and logging in if needed
+        
+        The open connection is reused while the server still answers NOOP
+        and it has sent fewer than SMTP_MAX_MESSAGES_PER_CONNECTION emails.
+        Callers must hold _smtp_lock.
+        """
+        server = self._smtp
+        if server is not None and self._smtp_sent < SMTP_MAX_MESSAGES_PER_CONNECTION:
+            try:
+                if server.noop()[0] == 250:
+                    return server
+            except (smtplib.SMTPException, OSError):
+                pass
+        self._close_smtp_connection()
+        
+        server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=SMTP_TIMEOUT)
+        try:
+            if self.smtp_use_tls:
+                server.starttls()
+            
+            # Login if credentials provided
+            if self.smtp_user and self.smtp_password:
+                server.login(self.smtp_user, self.smtp_password)
+        except Exception:
+            server.close()
+            raise
+        
+        self._smtp = server
+        self._smtp_sent = 0
+        return server
+    
+    def _close_smtp_connection(self) -> None:
+        """Quit and forget the open SMTP connection, if any"""
+        server, self._smtp = self._smtp, None
+        if server is None:
+            return
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+    
     def _format_bytes(self, bytes_count: int) -> str:
         """Format bytes to human-readable string"""
         for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
@@ -15,6 +15,13 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Seconds an idle multiplexed SSH master connection is kept open
+SSH_CONTROL_PERSIST = 600
+
+# Unix socket paths are limited to ~104-108 bytes, and ssh appends a
+# temporary suffix while creating the socket
+SSH_CONTROL_PATH_MAX = 80
+
 
 class SSHConnectionService:
     """Service for managing SSH connections with key-based authentication"""
@@ -205,6 +212,8 @@ class SSHConnectionService:
                     conn["notes"] = notes
                 
                 self._save_connections()
+                # Drop any shared connection to the old host/port/user
+                self._close_control_master(connection_id)
                 logger.info(f"Updated SSH connection: {connection_id}")
                 return
         
@@ -234,6 +243,8 @@ class SSHConnectionService:
                     except Exception as e:
                         logger.warning(f"Failed to remove key from remote: {e}")
                 
+                self._close_control_master(connection_id)
+                
                 # Delete local key files
                 try:
                     Path(conn["private_key_path"]).unlink(missing_ok=True)
@@ -648,6 +659,49 @@ class SSHConnectionService:
             f'{conn["username"]}@{conn["host"]}'
         ]
     
+    def get_control_master_args(self, connection_id: str) -> List[str]:
+        """
+        Get SSH options that share one persistent connection per SSH connection
+        
+        The first ssh command opens a master connection that stays up for
+        SSH_CONTROL_PERSIST seconds after its last use; later commands run
+        over it without a new TCP connection and key exchange.
+        
+        Args:
+            connection_id: Connection UUID
+            
+        Returns:
+            List of SSH options to place before the destination, or an empty
+            list if the control socket path would be too long
+        """
+        control_path = self._get_control_path(connection_id)
+        if len(str(control_path)) > SSH_CONTROL_PATH_MAX:
+            return []
+        
+        return [
+            '-o', 'ControlMaster=auto',
+            '-o', f'ControlPath={control_path}',
+            '-o', f'ControlPersist={SSH_CONTROL_PERSIST}'
+        ]
+    
+    def _get_control_path(self, connection_id: str) -> Path:
+        """Get the control socket path for a connection's master"""
+        return self.keys_dir / f"cm-{connection_id}"
+    
+    def _close_control_master(self, connection_id: str) -> None:
+        """Stop a connection's multiplexed master, if one is running"""
+        control_path = self._get_control_path(connection_id)
+        if not control_path.exists():
+            return
+        try:
+            subprocess.run(
+                ['ssh', '-o', f'ControlPath={control_path}', '-O', 'exit', 'webzfs'],
+                capture_output=True,
+                timeout=5
+            )
+        except Exception as e:
+            logger.warning(f"Failed to close SSH master for {connection_id}: {e}")
+    
     def get_ssh_client(self, connection_id: str) -> paramiko.SSHClient:
         """
         Get a connected paramiko SSH client
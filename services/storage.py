@@ -253,6 +253,46 @@ class FileStorageService:
         
         return execution
     
+    def get_executions_marker(self) -> tuple[int | None, int | None]:
+        """Get a cheap marker that changes whenever executions or progress are written.
+
+        Execution records and progress updates are written by replacing
+        their files, which updates the history file's and the progress
+        directory's modification times. Only two stat calls are needed, so
+        callers can poll this to skip re-reading unchanged data.
+        """
+        marker: list[int | None] = []
+        for path in (self.history_file, self.progress_dir):
+            try:
+                marker.append(path.stat().st_mtime_ns)
+            except OSError:
+                marker.append(None)
+        return marker[0], marker[1]
+    
+    def get_latest_progress_updates(self, execution_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Get the most recent progress update for each of several executions.
+
+        Only the per-execution progress files are read, so callers that
+        already hold the execution records avoid re-reading the history
+        file once per execution.
+
+        Args:
+            execution_ids: Execution record IDs.
+
+        Returns:
+            Mapping of execution ID to its latest progress update.
+            Executions without any progress updates are omitted.
+        """
+        latest = {}
+        for execution_id in execution_ids:
+            progress_file = self.progress_dir / f"execution_{execution_id}.json"
+            if not progress_file.exists():
+                continue
+            updates = self._read_json(progress_file).get('updates')
+            if updates:
+                latest[execution_id] = updates[-1]
+        return latest
+    
     def get_active_executions(self) -> List[Dict[str, Any]]:
         """Get all active (running) executions.
 
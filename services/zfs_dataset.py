@@ -4,7 +4,7 @@ Handles dataset operations: create, destroy, list, clone, properties, etc.
 """
 import re
 import subprocess
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 from services.utils import is_netbsd, run_zfs_command
 
@@ -146,6 +146,62 @@ class ZFSDatasetService:
         except subprocess.CalledProcessError as e:
             raise Exception(f"Failed to list datasets: {e.stderr}")
     
+    def list_datasets_and_snapshots(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        List all datasets and all snapshots with a single 'zfs list'
+        
+        Dataset entries match list_datasets() and snapshot entries match
+        ZFSSnapshotService.list_snapshots(). Snapshots come in zfs's default
+        order (by dataset, then creation) rather than sorted by creation
+        across all datasets.
+        
+        Returns:
+            Tuple of (datasets, snapshots)
+        """
+        # NetBSD ZFS may not support the 'encryption' property
+        if is_netbsd():
+            properties = 'name,type,used,avail,refer,mountpoint,compression,compressratio,creation'
+        else:
+            properties = 'name,type,used,avail,refer,mountpoint,compression,compressratio,creation,encryption'
+        
+        try:
+            result = run_zfs_command(
+                ['zfs', 'list', '-H', '-t', 'filesystem,volume,snapshot', '-o', properties]
+            )
+        except subprocess.CalledProcessError as e:
+            raise Exception(f"Failed to list datasets: {e.stderr}")
+        
+        datasets = []
+        snapshots = []
+        for line in result.stdout.split('\n'):
+            parts = line.split('\t')
+            if len(parts) < 9:
+                continue
+            if parts[1] == 'snapshot':
+                dataset_name, _, snap_name = parts[0].partition('@')
+                snapshots.append({
+                    'name': parts[0],
+                    'dataset': dataset_name,
+                    'snapshot': snap_name,
+                    'used': parts[2],
+                    'refer': parts[4],
+                    'creation': parts[8]
+                })
+            else:
+                datasets.append({
+                    'name': parts[0],
+                    'type': parts[1],
+                    'used': parts[2],
+                    'avail': parts[3],
+                    'refer': parts[4],
+                    'mountpoint': parts[5],
+                    'compression': parts[6],
+                    'compressratio': parts[7],
+                    'encryption': parts[9] if len(parts) > 9 else '-'
+                })
+        
+        return datasets, snapshots
+    
     def get_dataset(self, dataset_name: str) -> Dict[str, Any]:
         """
         Get detailed information about a specific dataset
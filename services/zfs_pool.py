@@ -406,14 +406,20 @@ class ZFSPoolService:
             raise Exception(f"Failed to import pool: {e.stderr}")
     
     def get_pool_history(self, pool_name: str, internal: bool = False, 
-                        limit: Optional[int] = None) -> List[Dict[str, Any]]:
+                        limit: Optional[int] = None,
+                        offset: int = 0) -> List[Dict[str, Any]]:
         """
         Get command history for a pool
         
+        Entries are returned oldest first. limit and offset select a window
+        counted back from the most recent entry, so offset=0 with limit=N
+        returns the latest N entries.
+        
         Args:
             pool_name: Name of the pool
             internal: Include internal events
             limit: Maximum number of entries to return
+            offset: Number of most recent entries to skip
             
         Returns:
             List of history entries
@@ -428,16 +434,12 @@ class ZFSPoolService:
             
             result = run_zfs_command(cmd, timeout=timeout)
             
-            history = []
-            for line in result.stdout.strip().split('\n'):
-                if not line:
-                    continue
-                history.append({'entry': line})
-            
-            if limit:
-                history = history[-limit:]
+            # Only build entries for the requested window
+            lines = [line for line in result.stdout.splitlines() if line]
+            end = max(len(lines) - offset, 0)
+            start = max(end - limit, 0) if limit else 0
             
-            return history
+            return [{'entry': line} for line in lines[start:end]]
         
         except subprocess.TimeoutExpired:
             raise Exception(f"ZPool history command timed out after {timeout} seconds. History may be very large.")
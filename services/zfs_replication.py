@@ -504,6 +504,27 @@ class ZFSReplicationService:
         """
         return self.storage.get_execution_detail(execution_id)
     
+    def get_executions_marker(self) -> tuple[int | None, int | None]:
+        """
+        Get a cheap marker that changes whenever executions or progress change
+        
+        Returns:
+            Opaque tuple to compare with a previously returned marker
+        """
+        return self.storage.get_executions_marker()
+    
+    def get_latest_progress_updates(self, execution_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get the latest progress update for several executions at once
+        
+        Args:
+            execution_ids: Execution record IDs
+            
+        Returns:
+            Mapping of execution ID to its latest progress update
+        """
+        return self.storage.get_latest_progress_updates(execution_ids)
+    
     def get_active_executions(self) -> List[Dict[str, Any]]:
         """
         Get all active (running) executions
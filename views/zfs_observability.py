@@ -17,6 +17,41 @@ from auth.dependencies import get_current_user
 router = APIRouter(prefix="/zfs/observability", tags=["zfs-observability"], dependencies=[Depends(get_current_user)])
 observability_service = ZFSObservabilityService()
 
+# Text report framing shared by the download endpoints. The header is a single
+# format template so each report section costs one write instead of a handful
+# of list appends and separator allocations.
+_SEP_EQ = "=" * 80
+_SEP_DASH = "-" * 80
+_HEADER_TMPL = "{eq}\n{title}\nGenerated: {ts}\n{eq}\n\n"
+_FOOTER_TMPL = "\n{eq}\n{end}\n{eq}"
+
+# ARC keys that are either shown in KEY METRICS or are not statistics
+_ARC_SKIP_KEYS = frozenset({'error', 'size_human', 'c_max_human', 'hit_rate'})
+
+
+def _write_arc_summary(output: io.StringIO, arc_stats: dict) -> None:
+    """Write the body of an ARC summary report into output"""
+    if arc_stats.get('error'):
+        output.write(f"Error: {arc_stats['error']}\n")
+        return
+
+    output.write(f"KEY METRICS\n{_SEP_DASH}\n")
+    if 'size_human' in arc_stats:
+        output.write(f"ARC Size:           {arc_stats['size_human']}\n")
+    if 'c_max_human' in arc_stats:
+        output.write(f"ARC Max Size:       {arc_stats['c_max_human']}\n")
+    if 'hit_rate' in arc_stats:
+        output.write(f"Hit Rate:           {arc_stats['hit_rate']:.2f}%\n")
+    if 'hits' in arc_stats:
+        output.write(f"Cache Hits:         {arc_stats['hits']:,}\n")
+    if 'misses' in arc_stats:
+        output.write(f"Cache Misses:       {arc_stats['misses']:,}\n")
+    output.write(f"\nDETAILED STATISTICS\n{_SEP_DASH}\n")
+
+    for key, value in sorted(arc_stats.items()):
+        if key not in _ARC_SKIP_KEYS:
+            output.write(f"{key:.<50} {value}\n")
+
 
 @router.get("/", response_class=HTMLResponse)
 async def observability_index(request: Request):
@@ -746,40 +781,38 @@ async def download_module_parameters():
     """Download module parameters as text file"""
     try:
         parameters = observability_service.get_zfs_module_parameters()
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
+
         # Build text output
-        output_lines = []
-        output_lines.append("=" * 80)
-        output_lines.append(f"ZFS Kernel Module Parameters")
-        output_lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        output_lines.append("=" * 80)
-        output_lines.append("")
-        
+        output = io.StringIO()
+        output.write(_HEADER_TMPL.format(
+            eq=_SEP_EQ,
+            title="ZFS Kernel Module Parameters",
+            ts=now.strftime('%Y-%m-%d %H:%M:%S'),
+        ))
+
         if parameters.get('error'):
-            output_lines.append(f"Error: {parameters['error']}")
+            output.write(f"Error: {parameters['error']}\n")
         else:
             # Header
-            output_lines.append(f"{'Parameter':<50} {'Value':<30}")
-            output_lines.append("-" * 80)
-            
+            output.write(f"{'Parameter':<50} {'Value':<30}\n{_SEP_DASH}\n")
+
             # Sort parameters alphabetically
+            count = 0
             for key in sorted(parameters.keys()):
                 if key != 'error':
-                    value = str(parameters[key])
-                    output_lines.append(f"{key:<50} {value:<30}")
-            
-            output_lines.append("")
-            output_lines.append(f"Total parameters: {len([k for k in parameters.keys() if k != 'error'])}")
-        
-        output_lines.append("\n" + "=" * 80)
-        output_lines.append("End of Report")
-        output_lines.append("=" * 80)
-        
+                    output.write(f"{key:<50} {str(parameters[key]):<30}\n")
+                    count += 1
+
+            output.write(f"\nTotal parameters: {count}\n")
+
+        output.write(_FOOTER_TMPL.format(eq=_SEP_EQ, end="End of Report"))
+
         filename = f"zfs_module_parameters_{timestamp}.txt"
-        
+
         return PlainTextResponse(
-            content="\n".join(output_lines),
+            content=output.getvalue(),
             headers={
                 'Content-Disposition': f'attachment; filename="{filename}"'
             }
@@ -996,52 +1029,22 @@ async def download_arc_summary():
     """Download ARC summary as text file"""
     try:
         arc_stats = observability_service.get_arc_summary()
-        
+        now = datetime.now()
+
         # Build text output
-        output_lines = []
-        output_lines.append("=" * 80)
-        output_lines.append(f"ZFS ARC (Adaptive Replacement Cache) Summary")
-        output_lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        output_lines.append("=" * 80)
-        output_lines.append("")
-        
-        if arc_stats.get('error'):
-            output_lines.append(f"Error: {arc_stats['error']}")
-        else:
-            # Key metrics
-            output_lines.append("KEY METRICS")
-            output_lines.append("-" * 80)
-            if 'size_human' in arc_stats:
-                output_lines.append(f"ARC Size:           {arc_stats['size_human']}")
-            if 'c_max_human' in arc_stats:
-                output_lines.append(f"ARC Max Size:       {arc_stats['c_max_human']}")
-            if 'hit_rate' in arc_stats:
-                output_lines.append(f"Hit Rate:           {arc_stats['hit_rate']:.2f}%")
-            if 'hits' in arc_stats:
-                output_lines.append(f"Cache Hits:         {arc_stats['hits']:,}")
-            if 'misses' in arc_stats:
-                output_lines.append(f"Cache Misses:       {arc_stats['misses']:,}")
-            output_lines.append("")
-            
-            # All statistics
-            output_lines.append("DETAILED STATISTICS")
-            output_lines.append("-" * 80)
-            
-            # Skip special keys
-            skip_keys = {'error', 'size_human', 'c_max_human', 'hit_rate'}
-            
-            for key, value in sorted(arc_stats.items()):
-                if key not in skip_keys:
-                    output_lines.append(f"{key:.<50} {value}")
-        
-        output_lines.append("\n" + "=" * 80)
-        output_lines.append("End of Report")
-        output_lines.append("=" * 80)
-        
-        filename = f"arc_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-        
+        output = io.StringIO()
+        output.write(_HEADER_TMPL.format(
+            eq=_SEP_EQ,
+            title="ZFS ARC (Adaptive Replacement Cache) Summary",
+            ts=now.strftime('%Y-%m-%d %H:%M:%S'),
+        ))
+        _write_arc_summary(output, arc_stats)
+        output.write(_FOOTER_TMPL.format(eq=_SEP_EQ, end="End of Report"))
+
+        filename = f"arc_summary_{now.strftime('%Y%m%d_%H%M%S')}.txt"
+
         return PlainTextResponse(
-            content="\n".join(output_lines),
+            content=output.getvalue(),
             headers={
                 'Content-Disposition': f'attachment; filename="{filename}"'
             }
@@ -1177,11 +1180,13 @@ async def download_all_logs():
         zip_buffer = io.BytesIO()
         
         with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            now = datetime.now()
+            timestamp = now.strftime('%Y%m%d_%H%M%S')
+            ts_human = now.strftime('%Y-%m-%d %H:%M:%S')
             
             # Add README
             readme_content = f"""ZFS Observability Data Export
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Generated: {ts_human}
 
 This archive contains the following files:
 1. pool_history.txt - Command history for all pools
@@ -1200,12 +1205,10 @@ Each file contains detailed information about various aspects of your ZFS system
                 all_pools = pool_service.list_pools()
                 selected_pools = [p['name'] for p in all_pools]
                 
-                output_lines = []
-                output_lines.append("=" * 80)
-                output_lines.append(f"ZFS Pool History Report")
-                output_lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-                output_lines.append("=" * 80)
-                output_lines.append("")
+                output = io.StringIO()
+                output.write(_HEADER_TMPL.format(
+                    eq=_SEP_EQ, title="ZFS Pool History Report", ts=ts_human
+                ))
                 
                 for pool_name in selected_pools:
                     try:
@@ -1215,28 +1218,23 @@ Each file contains detailed information about various aspects of your ZFS system
                             internal=False
                         )
                         
-                        output_lines.append(f"\n{'=' * 80}")
-                        output_lines.append(f"Pool: {pool_name}")
-                        output_lines.append(f"{'=' * 80}")
-                        output_lines.append(f"Total entries: {len(pool_history)}\n")
+                        output.write(f"\n{_SEP_EQ}\nPool: {pool_name}\n{_SEP_EQ}\n")
+                        output.write(f"Total entries: {len(pool_history)}\n\n")
                         
                         for entry in pool_history:
-                            timestamp = entry.get('timestamp', '')
-                            command = entry.get('command', '')
+                            output.write(f"Timestamp: {entry.get('timestamp', '')}\n")
+                            output.write(f"Command:   {entry.get('command', '')}\n")
                             user = entry.get('user', '')
                             host = entry.get('host', '')
-                            
-                            output_lines.append(f"Timestamp: {timestamp}")
-                            output_lines.append(f"Command:   {command}")
                             if user:
-                                output_lines.append(f"User:      {user}")
+                                output.write(f"User:      {user}\n")
                             if host:
-                                output_lines.append(f"Host:      {host}")
-                            output_lines.append("-" * 80)
+                                output.write(f"Host:      {host}\n")
+                            output.write(_SEP_DASH + "\n")
                     except Exception as e:
-                        output_lines.append(f"\nError getting history for '{pool_name}': {str(e)}\n")
+                        output.write(f"\nError getting history for '{pool_name}': {str(e)}\n\n")
                 
-                zip_file.writestr('pool_history.txt', "\n".join(output_lines))
+                zip_file.writestr('pool_history.txt', output.getvalue())
             except Exception as e:
                 zip_file.writestr('pool_history.txt', f"Error: {str(e)}")
             
@@ -1245,12 +1243,10 @@ Each file contains detailed information about various aspects of your ZFS system
                 all_pools = pool_service.list_pools()
                 selected_pools = [p['name'] for p in all_pools]
                 
-                output_lines = []
-                output_lines.append("=" * 80)
-                output_lines.append(f"ZFS Pool Events Report")
-                output_lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-                output_lines.append("=" * 80)
-                output_lines.append("")
+                output = io.StringIO()
+                output.write(_HEADER_TMPL.format(
+                    eq=_SEP_EQ, title="ZFS Pool Events Report", ts=ts_human
+                ))
                 
                 for pool_name in selected_pools:
                     try:
@@ -1259,18 +1255,16 @@ Each file contains detailed information about various aspects of your ZFS system
                             verbose=True
                         )
                         
-                        output_lines.append(f"\n{'=' * 80}")
-                        output_lines.append(f"Pool: {pool_name}")
-                        output_lines.append(f"{'=' * 80}")
-                        output_lines.append(f"Total events: {len(events)}\n")
+                        output.write(f"\n{_SEP_EQ}\nPool: {pool_name}\n{_SEP_EQ}\n")
+                        output.write(f"Total events: {len(events)}\n\n")
                         
                         for event in events:
-                            output_lines.append(event.get('raw', str(event)))
-                            output_lines.append("")
+                            output.write(event.get('raw', str(event)))
+                            output.write("\n\n")
                     except Exception as e:
-                        output_lines.append(f"\nError getting events for '{pool_name}': {str(e)}\n")
+                        output.write(f"\nError getting events for '{pool_name}': {str(e)}\n\n")
                 
-                zip_file.writestr('pool_events.txt', "\n".join(output_lines))
+                zip_file.writestr('pool_events.txt', output.getvalue())
             except Exception as e:
                 zip_file.writestr('pool_events.txt', f"Error: {str(e)}")
             
@@ -1278,40 +1272,15 @@ Each file contains detailed information about various aspects of your ZFS system
             try:
                 arc_stats = observability_service.get_arc_summary()
                 
-                output_lines = []
-                output_lines.append("=" * 80)
-                output_lines.append(f"ZFS ARC (Adaptive Replacement Cache) Summary")
-                output_lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-                output_lines.append("=" * 80)
-                output_lines.append("")
+                output = io.StringIO()
+                output.write(_HEADER_TMPL.format(
+                    eq=_SEP_EQ,
+                    title="ZFS ARC (Adaptive Replacement Cache) Summary",
+                    ts=ts_human,
+                ))
+                _write_arc_summary(output, arc_stats)
                 
-                if arc_stats.get('error'):
-                    output_lines.append(f"Error: {arc_stats['error']}")
-                else:
-                    output_lines.append("KEY METRICS")
-                    output_lines.append("-" * 80)
-                    if 'size_human' in arc_stats:
-                        output_lines.append(f"ARC Size:           {arc_stats['size_human']}")
-                    if 'c_max_human' in arc_stats:
-                        output_lines.append(f"ARC Max Size:       {arc_stats['c_max_human']}")
-                    if 'hit_rate' in arc_stats:
-                        output_lines.append(f"Hit Rate:           {arc_stats['hit_rate']:.2f}%")
-                    if 'hits' in arc_stats:
-                        output_lines.append(f"Cache Hits:         {arc_stats['hits']:,}")
-                    if 'misses' in arc_stats:
-                        output_lines.append(f"Cache Misses:       {arc_stats['misses']:,}")
-                    output_lines.append("")
-                    
-                    output_lines.append("DETAILED STATISTICS")
-                    output_lines.append("-" * 80)
-                    
-                    skip_keys = {'error', 'size_human', 'c_max_human', 'hit_rate'}
-                    
-                    for key, value in sorted(arc_stats.items()):
-                        if key not in skip_keys:
-                            output_lines.append(f"{key:.<50} {value}")
-                
-                zip_file.writestr('arc_summary.txt', "\n".join(output_lines))
+                zip_file.writestr('arc_summary.txt', output.getvalue())
             except Exception as e:
                 zip_file.writestr('arc_summary.txt', f"Error: {str(e)}")
             
@@ -1322,15 +1291,13 @@ Each file contains detailed information about various aspects of your ZFS system
                     filter_pattern=None
                 )
                 
-                output_lines = []
-                output_lines.append("=" * 80)
-                output_lines.append(f"ZFS Kernel Debug Log")
-                output_lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-                output_lines.append("=" * 80)
-                output_lines.append("")
-                output_lines.extend(log_lines)
+                output = io.StringIO()
+                output.write(_HEADER_TMPL.format(
+                    eq=_SEP_EQ, title="ZFS Kernel Debug Log", ts=ts_human
+                ))
+                output.write("\n".join(log_lines))
                 
-                zip_file.writestr('kernel_log.txt', "\n".join(output_lines))
+                zip_file.writestr('kernel_log.txt', output.getvalue())
             except Exception as e:
                 zip_file.writestr('kernel_log.txt', f"Error: {str(e)}")
             
@@ -1341,17 +1308,13 @@ Each file contains detailed information about various aspects of your ZFS system
                     severity=None
                 )
                 
-                output_lines = []
-                output_lines.append("=" * 80)
-                output_lines.append(f"ZFS System Log (Syslog)")
-                output_lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-                output_lines.append("=" * 80)
-                output_lines.append("")
-                
-                for entry in syslog_entries:
-                    output_lines.append(entry.get('message', ''))
+                output = io.StringIO()
+                output.write(_HEADER_TMPL.format(
+                    eq=_SEP_EQ, title="ZFS System Log (Syslog)", ts=ts_human
+                ))
+                output.write("\n".join(entry.get('message', '') for entry in syslog_entries))
                 
-                zip_file.writestr('syslog.txt', "\n".join(output_lines))
+                zip_file.writestr('syslog.txt', output.getvalue())
             except Exception as e:
                 zip_file.writestr('syslog.txt', f"Error: {str(e)}")
             
@@ -1359,28 +1322,26 @@ Each file contains detailed information about various aspects of your ZFS system
             try:
                 parameters = observability_service.get_zfs_module_parameters()
                 
-                output_lines = []
-                output_lines.append("=" * 80)
-                output_lines.append(f"ZFS Kernel Module Parameters")
-                output_lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-                output_lines.append("=" * 80)
-                output_lines.append("")
+                output = io.StringIO()
+                output.write(_HEADER_TMPL.format(
+                    eq=_SEP_EQ, title="ZFS Kernel Module Parameters", ts=ts_human
+                ))
                 
                 if parameters.get('error'):
-                    output_lines.append(f"Error: {parameters['error']}")
+                    output.write(f"Error: {parameters['error']}\n")
                 else:
                     for key, value in sorted(parameters.items()):
                         if key != 'error':
-                            output_lines.append(f"{key:.<50} {value}")
+                            output.write(f"{key:.<50} {value}\n")
                 
-                zip_file.writestr('module_parameters.txt', "\n".join(output_lines))
+                zip_file.writestr('module_parameters.txt', output.getvalue())
             except Exception as e:
                 zip_file.writestr('module_parameters.txt', f"Error: {str(e)}")
         
         # Prepare the zip for download
         zip_buffer.seek(0)
         
-        filename = f"zfs_observability_{hostname}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+        filename = f"zfs_observability_{hostname}_{timestamp}.zip"
         
         return StreamingResponse(
             zip_buffer,
@@ -2,11 +2,19 @@
 ZFS Pool Management Views
 Provides web interface for ZFS pool operations
 """
+import asyncio
+import hashlib
+import io
 import re
-from fastapi import APIRouter, Request, Form, Depends
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
-from typing import Annotated
+import threading
+import time
+from datetime import datetime
+from fastapi import APIRouter, BackgroundTasks, Request, Form, Depends, HTTPException
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, PlainTextResponse, StreamingResponse, Response
+from starlette.concurrency import run_in_threadpool
+from typing import Annotated, Any, Dict, List, Optional, Tuple
 from config.templates import templates
+from config.responses import FastJSONResponse, redirect_to
 from services.zfs_pool import ZFSPoolService
 from services.zfs_dataset import ZFSDatasetService
 from services.disk_utils import DiskUtilsService
@@ -22,6 +30,33 @@ dataset_service = ZFSDatasetService()
 disk_service = DiskUtilsService()
 pool_usage_service = PoolUsageService()
 
+# Checkpoint support depends only on the host platform, so resolve it once
+# instead of on every pool detail view.
+_CHECKPOINT_SUPPORTED = pool_service.checkpoint_supported()
+
+# Largest page size accepted by the pool history view
+_HISTORY_MAX_PAGE = 1000
+
+# Number of history entries encoded per chunk when streaming downloads
+_HISTORY_CHUNK_ENTRIES = 256
+_DOWNLOAD_CACHE_CONTROL = "private, max-age=5"
+
+# A device name in a create pool form field (separated by commas or whitespace)
+_DEVICE_TOKEN = re.compile(r'[^\s,]+')
+
+# Disk enumeration for the create pool form is cached briefly so that
+# re-renders and refreshes of the form do not re-probe every disk.
+_DISK_CACHE_TTL = 10.0
+_disk_cache = None
+_disk_cache_lock = threading.Lock()
+
+# zpool status results, keyed by pool name, are reused for a few seconds so
+# moving between the detail and properties pages costs one zpool call.
+# Handlers that change a pool drop its entry.
+_STATUS_CACHE_TTL = 3.0
+_status_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_status_cache_lock = threading.Lock()
+
 
 def _get_min_data_device_size(topology: dict, disk_size_lookup: dict) -> int:
     """
@@ -64,6 +99,119 @@ def _get_min_data_device_size(topology: dict, disk_size_lookup: dict) -> int:
     return min_size
 
 
+def _append_group(vdevs: List[str], value: str, keyword: Optional[str], grouped: bool, mirror_if_many: bool) -> None:
+    """
+    Append the vdevs described by a device form value to vdevs.
+
+    Devices are separated by commas. When grouped is True, whitespace
+    separates one vdev's devices from the next; otherwise every device
+    belongs to a single group. Each non-empty group is preceded by keyword
+    (if any) and, when mirror_if_many is set and it has several devices,
+    by 'mirror'.
+    """
+    for group in (value.split() if grouped else (value,)):
+        device_list = _DEVICE_TOKEN.findall(group)
+        if not device_list:
+            continue
+        if keyword:
+            vdevs.append(keyword)
+        if mirror_if_many and len(device_list) > 1:
+            vdevs.append('mirror')
+        vdevs += device_list
+
+
+def _download_etag(*parts) -> str:
+    """
+    Build a quoted ETag for a download from the data it is generated from.
+
+    The "Generated" timestamp in the file body is deliberately left out so
+    that unchanged pool data keeps the same tag.
+    """
+    digest = hashlib.sha1(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return f'"{digest}"'
+
+
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Return a 304 response if the client already has the download for etag"""
+    if request.headers.get("if-none-match") == etag:
+        return Response(
+            status_code=304,
+            headers={"ETag": etag, "Cache-Control": _DOWNLOAD_CACHE_CONTROL}
+        )
+    return None
+
+
+def _get_create_form_disks():
+    """
+    Get the available disks for the create pool form, split by type.
+
+    Results are cached for _DISK_CACHE_TTL seconds.
+
+    Returns:
+        Tuple of (available_disks, hdds, ssds)
+    """
+    global _disk_cache
+    with _disk_cache_lock:
+        now = time.monotonic()
+        if _disk_cache is not None and now - _disk_cache[0] < _DISK_CACHE_TTL:
+            return _disk_cache[1]
+        available_disks = disk_service.get_available_disks()
+        hdds = [d for d in available_disks if d['type'] == 'HDD']
+        ssds = [d for d in available_disks if d['type'] == 'SSD']
+        _disk_cache = (now, (available_disks, hdds, ssds))
+        return _disk_cache[1]
+
+
+def _clear_disk_cache() -> None:
+    """Drop the cached create form disk list after pool membership changes"""
+    global _disk_cache
+    with _disk_cache_lock:
+        _disk_cache = None
+
+
+def _get_pool_status_cached(pool_name: str) -> Dict[str, Any]:
+    """Get pool status, reusing a result up to _STATUS_CACHE_TTL seconds old"""
+    with _status_cache_lock:
+        hit = _status_cache.get(pool_name)
+    if hit is not None and time.monotonic() - hit[0] < _STATUS_CACHE_TTL:
+        return hit[1]
+    status = pool_service.get_pool_status(pool_name)
+    with _status_cache_lock:
+        _status_cache[pool_name] = (time.monotonic(), status)
+    return status
+
+
+def _invalidate_pool_status(pool_name: str) -> None:
+    """Drop the cached status for a pool after it has been changed"""
+    with _status_cache_lock:
+        _status_cache.pop(pool_name, None)
+
+
+def valid_pool_name(pool_name: str) -> str:
+    """
+    Path dependency that rejects malformed pool names with a 404.
+
+    Uses the service's precompiled naming pattern so junk URLs are turned
+    away before any zpool command is dispatched.
+    """
+    if not ZFSPoolService.ZFS_POOL_NAME_PATTERN.match(pool_name):
+        raise HTTPException(status_code=404, detail="Pool not found")
+    return pool_name
+
+
+PoolName = Annotated[str, Depends(valid_pool_name)]
+
+
+async def _get_checkpoint_info(pool_name: str):
+    """Fetch checkpoint info for a pool, or None if unsupported or unavailable"""
+    if not _CHECKPOINT_SUPPORTED:
+        return None
+    try:
+        return await run_in_threadpool(pool_service.get_checkpoint_info, pool_name)
+    except Exception:
+        return None
+
+
 def _format_bytes_human(size_bytes: int) -> str:
     """Format a byte count to a human-readable string (e.g., 931.5 GB)"""
     if size_bytes <= 0:
@@ -176,7 +324,7 @@ def parse_pool_status(status_output: str) -> dict:
 async def pools_index(request: Request):
     """Display all ZFS pools"""
     try:
-        pools = pool_service.list_pools()
+        pools = await run_in_threadpool(pool_service.list_pools)
         return templates.TemplateResponse(
             request,
             name="zfs/pools/index.jinja",
@@ -198,21 +346,22 @@ async def pools_index(request: Request):
 
 
 @router.get("/{pool_name}", response_class=HTMLResponse)
-async def pool_detail(request: Request, pool_name: str):
+async def pool_detail(request: Request, pool_name: PoolName):
     """Display detailed pool information"""
     # If the pool is not imported (e.g. it was exported outside of WebZFS),
     # redirect back to the pools overview instead of crashing.
     try:
-        if not pool_service.pool_exists(pool_name):
-            return RedirectResponse(
-                url=f"/zfs/pools?error=Pool '{pool_name}' is not imported and cannot be displayed.",
-                status_code=303
-            )
+        if not await run_in_threadpool(pool_service.pool_exists, pool_name):
+            return redirect_to("/zfs/pools", error=f"Pool '{pool_name}' is not imported and cannot be displayed.")
     except Exception:
         pass
     try:
-        pool_status = pool_service.get_pool_status(pool_name)
-
+        # Status and checkpoint lookups are independent zpool invocations,
+        # so run them concurrently rather than back to back.
+        pool_status, checkpoint_info = await asyncio.gather(
+            run_in_threadpool(_get_pool_status_cached, pool_name),
+            _get_checkpoint_info(pool_name),
+        )
 
         # Parse structured data from status output
         parsed = parse_pool_status(pool_status.get('status_output', ''))
@@ -223,7 +372,7 @@ async def pool_detail(request: Request, pool_name: str):
         mountpoint_source = ''
         dataset_props = {}
         try:
-            dataset_props = dataset_service.get_properties(pool_name)
+            dataset_props = await run_in_threadpool(dataset_service.get_properties, pool_name)
             if 'reservation' in dataset_props:
                 reservation_value = dataset_props['reservation'].get('value', 'none')
             if 'mountpoint' in dataset_props:
@@ -282,15 +431,6 @@ async def pool_detail(request: Request, pool_name: str):
             except (ValueError, TypeError):
                 pass
 
-        # Get checkpoint info if supported
-        checkpoint_info = None
-        checkpoint_supported = pool_service.checkpoint_supported()
-        if checkpoint_supported:
-            try:
-                checkpoint_info = pool_service.get_checkpoint_info(pool_name)
-            except Exception:
-                checkpoint_info = None
-
         return templates.TemplateResponse(
             request,
             name="zfs/pools/detail.jinja",
@@ -306,7 +446,7 @@ async def pool_detail(request: Request, pool_name: str):
                 "zfs_total": zfs_total,
                 "zfs_cap": zfs_cap,
                 "checkpoint_info": checkpoint_info,
-                "checkpoint_supported": checkpoint_supported,
+                "checkpoint_supported": _CHECKPOINT_SUPPORTED,
                 "page_title": f"Pool: {pool_name}"
             }
         )
@@ -322,7 +462,7 @@ async def pool_detail(request: Request, pool_name: str):
 
 
 @router.get("/{pool_name}/space-tree", response_class=JSONResponse)
-async def pool_space_tree(request: Request, pool_name: str):
+async def pool_space_tree(request: Request, pool_name: PoolName):
     """
     Return a nested dataset space-usage tree for the visualizer.
 
@@ -340,19 +480,27 @@ async def pool_space_tree(request: Request, pool_name: str):
 
 
 @router.get("/{pool_name}/history", response_class=HTMLResponse)
-async def pool_history(request: Request, pool_name: str):
-    """Display pool command history"""
+async def pool_history(request: Request, pool_name: PoolName, limit: int = 100, offset: int = 0):
+    """Display one page of pool command history, newest page first"""
+    limit = max(1, min(limit, _HISTORY_MAX_PAGE))
+    offset = max(offset, 0)
     try:
-        if not pool_service.pool_exists(pool_name):
-            return RedirectResponse(
-                url=f"/zfs/pools?error=Pool '{pool_name}' is not imported and cannot be displayed.",
-                status_code=303
-            )
+        if not await run_in_threadpool(pool_service.pool_exists, pool_name):
+            return redirect_to("/zfs/pools", error=f"Pool '{pool_name}' is not imported and cannot be displayed.")
     except Exception:
         pass
     try:
-        history = pool_service.get_pool_history(pool_name, internal=False, limit=1000)
-
+        # Fetch one extra entry to find out whether an older page exists
+        history = await run_in_threadpool(
+            pool_service.get_pool_history,
+            pool_name,
+            internal=False,
+            limit=limit + 1,
+            offset=offset,
+        )
+        has_older = len(history) > limit
+        if has_older:
+            history = history[1:]
         
         return templates.TemplateResponse(
             request,
@@ -360,6 +508,9 @@ async def pool_history(request: Request, pool_name: str):
             context={
                 "pool_name": pool_name,
                 "history": history,
+                "limit": limit,
+                "offset": offset,
+                "has_older": has_older,
                 "page_title": f"Pool History: {pool_name}"
             }
         )
@@ -375,45 +526,49 @@ async def pool_history(request: Request, pool_name: str):
 
 
 @router.get("/{pool_name}/history/download")
-async def download_pool_history(pool_name: str):
+async def download_pool_history(request: Request, pool_name: PoolName):
     """Download pool history as text file"""
     try:
-        from fastapi.responses import PlainTextResponse
-        from datetime import datetime
-        
-        history = pool_service.get_pool_history(pool_name, internal=False, limit=5000)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Format output
-        output_lines = []
-        output_lines.append("=" * 80)
-        output_lines.append(f"ZFS Pool History: {pool_name}")
-        output_lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        output_lines.append("=" * 80)
-        output_lines.append("")
-        
-        if history:
-            for entry in history:
-                output_lines.append(entry.get('entry', ''))
-            
-            output_lines.append("")
-            output_lines.append(f"Total entries: {len(history)}")
-        else:
-            output_lines.append("No history entries found")
-        
-        output_lines.append("")
-        output_lines.append("=" * 80)
+        history = await run_in_threadpool(
+            pool_service.get_pool_history, pool_name, internal=False, limit=5000
+        )
+        etag = _download_etag(
+            pool_name, len(history), history[-1].get('entry') if history else None
+        )
+        not_modified = _not_modified(request, etag)
+        if not_modified:
+            return not_modified
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
+        header = (
+            f"{'=' * 80}\n"
+            f"ZFS Pool History: {pool_name}\n"
+            f"Generated: {now.strftime('%Y-%m-%d %H:%M:%S')}\n"
+            f"{'=' * 80}\n\n"
+        )
         
-        content = "\n".join(output_lines)
+        def generate():
+            # Emit the history in fixed-size batches of entries so the full
+            # report is never materialized and each chunk is one socket write.
+            yield header.encode()
+            if not history:
+                yield f"No history entries found\n\n{'=' * 80}".encode()
+                return
+            for i in range(0, len(history), _HISTORY_CHUNK_ENTRIES):
+                batch = history[i:i + _HISTORY_CHUNK_ENTRIES]
+                yield "".join(f"{entry.get('entry', '')}\n" for entry in batch).encode()
+            yield f"\nTotal entries: {len(history)}\n\n{'=' * 80}".encode()
         
-        return PlainTextResponse(
-            content=content,
+        return StreamingResponse(
+            generate(),
+            media_type="text/plain; charset=utf-8",
             headers={
-                "Content-Disposition": f'attachment; filename="pool_{pool_name}_history_{timestamp}.txt"'
+                "Content-Disposition": f'attachment; filename="pool_{pool_name}_history_{timestamp}.txt"',
+                "ETag": etag,
+                "Cache-Control": _DOWNLOAD_CACHE_CONTROL,
             }
         )
     except Exception as e:
-        from fastapi.responses import PlainTextResponse
         return PlainTextResponse(
             content=f"Error generating history file: {str(e)}",
             status_code=500
@@ -421,56 +576,62 @@ async def download_pool_history(pool_name: str):
 
 
 @router.post("/{pool_name}/scrub", response_class=HTMLResponse)
-async def scrub_pool(request: Request, pool_name: str, current_user: str = Depends(get_current_user)):
+async def scrub_pool(
+    request: Request,
+    pool_name: PoolName,
+    background_tasks: BackgroundTasks,
+    current_user: str = Depends(get_current_user)
+):
     """Start pool scrub"""
     try:
-        pool_service.scrub_pool(pool_name)
-        audit_logger.log_pool_scrub(user=current_user, pool_name=pool_name, action="start")
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}?message=Scrub started successfully",
-            status_code=303
-        )
+        await run_in_threadpool(pool_service.scrub_pool, pool_name)
+        _invalidate_pool_status(pool_name)
+        background_tasks.add_task(audit_logger.log_pool_scrub, user=current_user, pool_name=pool_name, action="start")
+        return redirect_to(f"/zfs/pools/{pool_name}", message="Scrub started successfully")
     except Exception as e:
-        audit_logger.log_pool_scrub(user=current_user, pool_name=pool_name, action="start", success=False, error=str(e))
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}?error={str(e)}",
-            status_code=303
-        )
+        background_tasks.add_task(audit_logger.log_pool_scrub, user=current_user, pool_name=pool_name, action="start", success=False, error=str(e))
+        return redirect_to(f"/zfs/pools/{pool_name}", error=str(e))
 
 
 @router.post("/{pool_name}/scrub/stop", response_class=HTMLResponse)
-async def stop_scrub(request: Request, pool_name: str, current_user: str = Depends(get_current_user)):
+async def stop_scrub(
+    request: Request,
+    pool_name: PoolName,
+    background_tasks: BackgroundTasks,
+    current_user: str = Depends(get_current_user)
+):
     """Stop pool scrub"""
     try:
-        pool_service.stop_scrub(pool_name)
-        audit_logger.log_pool_scrub(user=current_user, pool_name=pool_name, action="stop")
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}?message=Scrub stopped successfully",
-            status_code=303
-        )
+        await run_in_threadpool(pool_service.stop_scrub, pool_name)
+        _invalidate_pool_status(pool_name)
+        background_tasks.add_task(audit_logger.log_pool_scrub, user=current_user, pool_name=pool_name, action="stop")
+        return redirect_to(f"/zfs/pools/{pool_name}", message="Scrub stopped successfully")
     except Exception as e:
-        audit_logger.log_pool_scrub(user=current_user, pool_name=pool_name, action="stop", success=False, error=str(e))
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}?error={str(e)}",
-            status_code=303
-        )
+        background_tasks.add_task(audit_logger.log_pool_scrub, user=current_user, pool_name=pool_name, action="stop", success=False, error=str(e))
+        return redirect_to(f"/zfs/pools/{pool_name}", error=str(e))
 
 
 @router.get("/create/form", response_class=HTMLResponse)
 async def create_pool_form(request: Request):
     """Display pool creation form"""
+    # A failed submission redirects back here with its error and inputs
+    params = request.query_params
+    prefill = {
+        "error": params.get("error"),
+        "pool_name": params.get("pool_name", ""),
+        "vdev_type": params.get("vdev_type", ""),
+        "devices": params.get("devices", ""),
+        "ashift": params.get("ashift", ""),
+    }
     try:
-        # Get available disks
-        available_disks = disk_service.get_available_disks()
-        
-        # Separate disks by type and status
-        hdds = [d for d in available_disks if d['type'] == 'HDD']
-        ssds = [d for d in available_disks if d['type'] == 'SSD']
+        # Get available disks, separated by type
+        available_disks, hdds, ssds = await run_in_threadpool(_get_create_form_disks)
         
         return templates.TemplateResponse(
             request,
             name="zfs/pools/create.jinja",
             context={
+                **prefill,
                 "available_disks": available_disks,
                 "hdds": hdds,
                 "ssds": ssds,
@@ -482,6 +643,7 @@ async def create_pool_form(request: Request):
             request,
             name="zfs/pools/create.jinja",
             context={
+                **prefill,
                 "available_disks": [],
                 "hdds": [],
                 "ssds": [],
@@ -491,17 +653,17 @@ async def create_pool_form(request: Request):
         )
 
 
-@router.get("/create/check-disk-usage", response_class=JSONResponse)
+@router.get("/create/check-disk-usage", response_class=FastJSONResponse)
 async def check_disk_usage(request: Request):
     """Check disk usage status for pool creation"""
     try:
-        disk_status = disk_service.check_disk_usage_status()
-        return JSONResponse(content={
+        disk_status = await run_in_threadpool(disk_service.check_disk_usage_status)
+        return FastJSONResponse(content={
             "success": True,
             "disk_status": disk_status
         })
     except Exception as e:
-        return JSONResponse(
+        return FastJSONResponse(
             content={
                 "success": False,
                 "error": str(e)
@@ -513,6 +675,7 @@ async def check_disk_usage(request: Request):
 @router.post("/create", response_class=HTMLResponse)
 async def create_pool(
     request: Request,
+    background_tasks: BackgroundTasks,
     pool_name: Annotated[str, Form()],
     vdev_type: Annotated[str, Form()],
     devices: Annotated[str, Form()],
@@ -527,97 +690,59 @@ async def create_pool(
 ):
     """Create a new pool"""
     try:
-        # Build vdev specification
-        vdevs = []
-        
-        # Parse data vdevs - can have multiple vdevs separated by spaces
-        # Format: "vdev1disk1,vdev1disk2 vdev2disk1,vdev2disk2"
-        for vdev_devices in devices.split():
-            device_list = [d.strip() for d in vdev_devices.split(',') if d.strip()]
-            if device_list:
-                if vdev_type != "single":
-                    vdevs.append(vdev_type)
-                vdevs.extend(device_list)
-        
-        # Add spare devices
-        if spare_devices:
-            spare_list = [d.strip() for d in spare_devices.split(',') if d.strip()]
-            if spare_list:
-                vdevs.append('spare')
-                vdevs.extend(spare_list)
-        
-        # Add cache devices
-        if cache_devices:
-            cache_list = [d.strip() for d in cache_devices.split(',') if d.strip()]
-            if cache_list:
-                vdevs.append('cache')
-                vdevs.extend(cache_list)
-        
-        # Add log devices (SLOG)
-        if log_devices:
-            log_list = [d.strip() for d in log_devices.split(',') if d.strip()]
-            if log_list:
-                vdevs.append('log')
-                # Mirror log devices if there are multiple
-                if len(log_list) > 1:
-                    vdevs.append('mirror')
-                vdevs.extend(log_list)
-        
-        # Add metadata special vdevs
-        # Format: "mirror1disk1,mirror1disk2 mirror2disk1,mirror2disk2"
-        if metadata_devices:
-            for mirror_devices in metadata_devices.split():
-                device_list = [d.strip() for d in mirror_devices.split(',') if d.strip()]
-                if device_list:
-                    vdevs.append('special')
-                    if len(device_list) > 1:
-                        vdevs.append('mirror')
-                    vdevs.extend(device_list)
-        
-        # Add dedup devices
-        if dedup_devices:
-            dedup_list = [d.strip() for d in dedup_devices.split(',') if d.strip()]
-            if dedup_list:
-                vdevs.append('dedup')
-                # Mirror dedup devices if there are multiple
-                if len(dedup_list) > 1:
-                    vdevs.append('mirror')
-                vdevs.extend(dedup_list)
+        # Build vdev specification. Each row is (form value, vdev keyword,
+        # one vdev per space-separated group, mirror vdevs with several devices).
+        # Grouped values use the format "vdev1disk1,vdev1disk2 vdev2disk1,vdev2disk2"
+        vdevs: List[str] = []
+        vdev_groups = (
+            (devices, None if vdev_type == "single" else vdev_type, True, False),
+            (spare_devices, 'spare', False, False),
+            (cache_devices, 'cache', False, False),
+            (log_devices, 'log', False, True),
+            (metadata_devices, 'special', True, True),
+            (dedup_devices, 'dedup', False, True),
+        )
+        for value, keyword, grouped, mirror_if_many in vdev_groups:
+            if value:
+                _append_group(vdevs, value, keyword, grouped, mirror_if_many)
         
         # Build properties dictionary
         properties = {}
         if ashift:
             properties['ashift'] = ashift
         
-        pool_service.create_pool(pool_name, vdevs, properties=properties if properties else None, force=force)
+        await run_in_threadpool(
+            pool_service.create_pool,
+            pool_name,
+            vdevs,
+            properties=properties if properties else None,
+            force=force,
+        )
+        _clear_disk_cache()
+        _invalidate_pool_status(pool_name)
         
         # Log successful pool creation
-        audit_logger.log_pool_create(user=current_user, pool_name=pool_name, vdevs=vdevs)
+        background_tasks.add_task(audit_logger.log_pool_create, user=current_user, pool_name=pool_name, vdevs=vdevs)
         
-        return RedirectResponse(
-            url=f"/zfs/pools?message=Pool {pool_name} created successfully",
-            status_code=303
-        )
+        return redirect_to("/zfs/pools", message=f"Pool {pool_name} created successfully")
     except Exception as e:
         # Log failed pool creation
-        audit_logger.log_pool_create(user=current_user, pool_name=pool_name, vdevs=vdevs, success=False, error=str(e))
+        background_tasks.add_task(audit_logger.log_pool_create, user=current_user, pool_name=pool_name, vdevs=vdevs, success=False, error=str(e))
         
-        return templates.TemplateResponse(
-            request,
-            name="zfs/pools/create.jinja",
-            context={
-                "error": str(e),
-                "pool_name": pool_name,
-                "vdev_type": vdev_type,
-                "devices": devices,
-                "ashift": ashift,
-                "page_title": "Create ZFS Pool"
-            }
+        # Redirect back to the form (post/redirect/get) so a refresh does
+        # not resubmit the pool creation
+        return redirect_to(
+            "/zfs/pools/create/form",
+            error=str(e),
+            pool_name=pool_name,
+            vdev_type=vdev_type,
+            devices=devices,
+            ashift=ashift,
         )
 
 
 @router.get("/{pool_name}/export/confirm", response_class=HTMLResponse)
-async def export_pool_confirm(request: Request, pool_name: str):
+async def export_pool_confirm(request: Request, pool_name: PoolName):
     """Display export confirmation page"""
     return templates.TemplateResponse(
         request,
@@ -632,28 +757,25 @@ async def export_pool_confirm(request: Request, pool_name: str):
 @router.post("/{pool_name}/export", response_class=HTMLResponse)
 async def export_pool(
     request: Request,
-    pool_name: str,
+    pool_name: PoolName,
+    background_tasks: BackgroundTasks,
     force: Annotated[bool, Form()] = False,
     current_user: str = Depends(get_current_user)
 ):
     """Export a pool"""
     try:
-        pool_service.export_pool(pool_name, force=force)
-        audit_logger.log_pool_export(user=current_user, pool_name=pool_name, force=force)
-        return RedirectResponse(
-            url="/zfs/pools?message=Pool exported successfully",
-            status_code=303
-        )
+        await run_in_threadpool(pool_service.export_pool, pool_name, force=force)
+        _invalidate_pool_status(pool_name)
+        _clear_disk_cache()
+        background_tasks.add_task(audit_logger.log_pool_export, user=current_user, pool_name=pool_name, force=force)
+        return redirect_to("/zfs/pools", message="Pool exported successfully")
     except Exception as e:
-        audit_logger.log_pool_export(user=current_user, pool_name=pool_name, force=force, success=False, error=str(e))
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}?error={str(e)}",
-            status_code=303
-        )
+        background_tasks.add_task(audit_logger.log_pool_export, user=current_user, pool_name=pool_name, force=force, success=False, error=str(e))
+        return redirect_to(f"/zfs/pools/{pool_name}", error=str(e))
 
 
 @router.get("/{pool_name}/export/investigate", response_class=HTMLResponse)
-async def investigate_pool_usage(request: Request, pool_name: str):
+async def investigate_pool_usage(request: Request, pool_name: PoolName):
     """
     Investigate why a pool cannot be exported.
 
@@ -688,7 +810,7 @@ async def investigate_pool_usage(request: Request, pool_name: str):
 async def import_pools_list(request: Request):
     """Display list of importable pools"""
     try:
-        importable_pools = pool_service.get_importable_pools()
+        importable_pools = await run_in_threadpool(pool_service.get_importable_pools)
         return templates.TemplateResponse(
             request,
             name="zfs/pools/import.jinja",
@@ -712,39 +834,33 @@ async def import_pools_list(request: Request):
 @router.post("/import/{pool_name}", response_class=HTMLResponse)
 async def import_pool(
     request: Request,
-    pool_name: str,
+    pool_name: PoolName,
+    background_tasks: BackgroundTasks,
     force: Annotated[bool, Form()] = False,
     current_user: str = Depends(get_current_user)
 ):
     """Import a pool"""
     try:
-        pool_service.import_pool(pool_name, force=force)
-        audit_logger.log_pool_import(user=current_user, pool_name=pool_name, force=force)
-        return RedirectResponse(
-            url=f"/zfs/pools?message=Pool {pool_name} imported successfully",
-            status_code=303
-        )
+        await run_in_threadpool(pool_service.import_pool, pool_name, force=force)
+        _invalidate_pool_status(pool_name)
+        _clear_disk_cache()
+        background_tasks.add_task(audit_logger.log_pool_import, user=current_user, pool_name=pool_name, force=force)
+        return redirect_to("/zfs/pools", message=f"Pool {pool_name} imported successfully")
     except Exception as e:
-        audit_logger.log_pool_import(user=current_user, pool_name=pool_name, force=force, success=False, error=str(e))
-        return RedirectResponse(
-            url="/zfs/pools/import/list?error=" + str(e),
-            status_code=303
-        )
+        background_tasks.add_task(audit_logger.log_pool_import, user=current_user, pool_name=pool_name, force=force, success=False, error=str(e))
+        return redirect_to("/zfs/pools/import/list", error=str(e))
 
 
 @router.get("/{pool_name}/properties", response_class=HTMLResponse)
-async def pool_properties(request: Request, pool_name: str):
+async def pool_properties(request: Request, pool_name: PoolName):
     """Display pool properties"""
     try:
-        if not pool_service.pool_exists(pool_name):
-            return RedirectResponse(
-                url=f"/zfs/pools?error=Pool '{pool_name}' is not imported and cannot be displayed.",
-                status_code=303
-            )
+        if not await run_in_threadpool(pool_service.pool_exists, pool_name):
+            return redirect_to("/zfs/pools", error=f"Pool '{pool_name}' is not imported and cannot be displayed.")
     except Exception:
         pass
     try:
-        pool_status = pool_service.get_pool_status(pool_name)
+        pool_status = await run_in_threadpool(_get_pool_status_cached, pool_name)
         properties = pool_status.get('properties', {})
 
         
@@ -771,83 +887,90 @@ async def pool_properties(request: Request, pool_name: str):
 @router.post("/{pool_name}/properties", response_class=HTMLResponse)
 async def set_pool_property(
     request: Request,
-    pool_name: str,
+    pool_name: PoolName,
+    background_tasks: BackgroundTasks,
     property_name: Annotated[str, Form()],
     property_value: Annotated[str, Form()],
     current_user: str = Depends(get_current_user)
 ):
     """Set a pool property"""
     try:
-        pool_service.set_pool_property(pool_name, property_name, property_value)
-        audit_logger.log_pool_property_change(
+        await run_in_threadpool(
+            pool_service.set_pool_property, pool_name, property_name, property_value
+        )
+        _invalidate_pool_status(pool_name)
+        background_tasks.add_task(
+            audit_logger.log_pool_property_change,
             user=current_user, pool_name=pool_name, 
             property_name=property_name, property_value=property_value
         )
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}/properties?message=Property updated successfully",
-            status_code=303
-        )
+        return redirect_to(f"/zfs/pools/{pool_name}/properties", message="Property updated successfully")
     except Exception as e:
-        audit_logger.log_pool_property_change(
+        background_tasks.add_task(
+            audit_logger.log_pool_property_change,
             user=current_user, pool_name=pool_name,
             property_name=property_name, property_value=property_value,
             success=False, error=str(e)
         )
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}/properties?error={str(e)}",
-            status_code=303
-        )
+        return redirect_to(f"/zfs/pools/{pool_name}/properties", error=str(e))
 
 
 @router.get("/{pool_name}/properties/download")
-async def download_pool_properties(pool_name: str):
+async def download_pool_properties(request: Request, pool_name: PoolName):
     """Download pool properties as text file"""
     try:
-        from fastapi.responses import PlainTextResponse
-        from datetime import datetime
-        
-        pool_status = pool_service.get_pool_status(pool_name)
+        pool_status = await run_in_threadpool(_get_pool_status_cached, pool_name)
         properties = pool_status.get('properties', {})
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        etag = _download_etag(
+            pool_name,
+            sorted(
+                (name, data.get('value'), data.get('source'))
+                for name, data in properties.items()
+            ),
+        )
+        not_modified = _not_modified(request, etag)
+        if not_modified:
+            return not_modified
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         
         # Format output
-        output_lines = []
-        output_lines.append("=" * 80)
-        output_lines.append(f"ZFS Pool Properties: {pool_name}")
-        output_lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        output_lines.append("=" * 80)
-        output_lines.append("")
+        buf = io.StringIO()
+        buf.write(
+            f"{'=' * 80}\n"
+            f"ZFS Pool Properties: {pool_name}\n"
+            f"Generated: {now.strftime('%Y-%m-%d %H:%M:%S')}\n"
+            f"{'=' * 80}\n\n"
+        )
         
         if properties:
             # Header
-            output_lines.append(f"{'Property':<30} {'Value':<30} {'Source':<20}")
-            output_lines.append("-" * 80)
+            buf.write(f"{'Property':<30} {'Value':<30} {'Source':<20}\n{'-' * 80}\n")
             
             # Property rows (sorted alphabetically)
-            for prop_name in sorted(properties.keys()):
+            for prop_name in sorted(properties):
                 prop_data = properties[prop_name]
-                value = str(prop_data.get('value', '-'))
-                source = str(prop_data.get('source', '-'))
-                output_lines.append(f"{prop_name:<30} {value:<30} {source:<20}")
+                buf.write(
+                    f"{prop_name:<30} {prop_data.get('value', '-')!s:<30} "
+                    f"{prop_data.get('source', '-')!s:<20}\n"
+                )
             
-            output_lines.append("")
-            output_lines.append(f"Total properties: {len(properties)}")
+            buf.write(f"\nTotal properties: {len(properties)}\n")
         else:
-            output_lines.append("No properties available")
-        
-        output_lines.append("")
-        output_lines.append("=" * 80)
+            buf.write("No properties available\n")
         
-        content = "\n".join(output_lines)
+        buf.write(f"\n{'=' * 80}")
+        content = buf.getvalue()
         
         return PlainTextResponse(
             content=content,
             headers={
-                "Content-Disposition": f'attachment; filename="pool_{pool_name}_properties_{timestamp}.txt"'
+                "Content-Disposition": f'attachment; filename="pool_{pool_name}_properties_{timestamp}.txt"',
+                "ETag": etag,
+                "Cache-Control": _DOWNLOAD_CACHE_CONTROL,
             }
         )
     except Exception as e:
-        from fastapi.responses import PlainTextResponse
         return PlainTextResponse(
             content=f"Error generating properties file: {str(e)}",
             status_code=500
@@ -857,60 +980,50 @@ async def download_pool_properties(pool_name: str):
 @router.post("/{pool_name}/checkpoint", response_class=HTMLResponse)
 async def create_checkpoint(
     request: Request,
-    pool_name: str,
+    pool_name: PoolName,
+    background_tasks: BackgroundTasks,
     current_user: str = Depends(get_current_user)
 ):
     """Create a checkpoint for the pool"""
     try:
-        pool_service.create_checkpoint(pool_name)
-        audit_logger.log_pool_checkpoint_create(user=current_user, pool_name=pool_name)
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}?message=Checkpoint created successfully",
-            status_code=303
-        )
+        await run_in_threadpool(pool_service.create_checkpoint, pool_name)
+        _invalidate_pool_status(pool_name)
+        background_tasks.add_task(audit_logger.log_pool_checkpoint_create, user=current_user, pool_name=pool_name)
+        return redirect_to(f"/zfs/pools/{pool_name}", message="Checkpoint created successfully")
     except Exception as e:
-        audit_logger.log_pool_checkpoint_create(
+        background_tasks.add_task(
+            audit_logger.log_pool_checkpoint_create,
             user=current_user, pool_name=pool_name, success=False, error=str(e)
         )
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}?error={str(e)}",
-            status_code=303
-        )
+        return redirect_to(f"/zfs/pools/{pool_name}", error=str(e))
 
 
 @router.post("/{pool_name}/checkpoint/discard", response_class=HTMLResponse)
 async def discard_checkpoint(
     request: Request,
-    pool_name: str,
+    pool_name: PoolName,
+    background_tasks: BackgroundTasks,
     current_user: str = Depends(get_current_user)
 ):
     """Discard the checkpoint for the pool"""
     try:
-        pool_service.discard_checkpoint(pool_name)
-        audit_logger.log_pool_checkpoint_discard(user=current_user, pool_name=pool_name)
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}?message=Checkpoint discarded successfully",
-            status_code=303
-        )
+        await run_in_threadpool(pool_service.discard_checkpoint, pool_name)
+        _invalidate_pool_status(pool_name)
+        background_tasks.add_task(audit_logger.log_pool_checkpoint_discard, user=current_user, pool_name=pool_name)
+        return redirect_to(f"/zfs/pools/{pool_name}", message="Checkpoint discarded successfully")
     except Exception as e:
-        audit_logger.log_pool_checkpoint_discard(
+        background_tasks.add_task(
+            audit_logger.log_pool_checkpoint_discard,
             user=current_user, pool_name=pool_name, success=False, error=str(e)
         )
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}?error={str(e)}",
-            status_code=303
-        )
+        return redirect_to(f"/zfs/pools/{pool_name}", error=str(e))
 
 # ==================== Diagnostics Routes ====================
 
 
 @router.get("/{pool_name}/diagnostics/download")
-async def download_pool_diagnostics(pool_name: str):
+async def download_pool_diagnostics(pool_name: PoolName):
     """Download a zip file of diagnostic information for a faulted/suspended pool."""
-    from fastapi.responses import StreamingResponse
-    from datetime import datetime
-    import io
-
     try:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         zip_bytes = collect_pool_diagnostics(pool_name)
@@ -926,7 +1039,6 @@ async def download_pool_diagnostics(pool_name: str):
             }
         )
     except Exception as e:
-        from fastapi.responses import PlainTextResponse
         return PlainTextResponse(
             content=f"Error collecting diagnostics: {str(e)}",
             status_code=500
@@ -936,14 +1048,11 @@ async def download_pool_diagnostics(pool_name: str):
 
 
 @router.get("/{pool_name}/vdevs", response_class=HTMLResponse)
-async def vdev_management(request: Request, pool_name: str):
+async def vdev_management(request: Request, pool_name: PoolName):
     """Display vdev management page shell (data loaded async via JS)"""
     try:
         if not pool_service.pool_exists(pool_name):
-            return RedirectResponse(
-                url=f"/zfs/pools?error=Pool '{pool_name}' is not imported and cannot be displayed.",
-                status_code=303
-            )
+            return redirect_to("/zfs/pools", error=f"Pool '{pool_name}' is not imported and cannot be displayed.")
     except Exception:
         pass
     return templates.TemplateResponse(
@@ -957,7 +1066,7 @@ async def vdev_management(request: Request, pool_name: str):
 
 
 @router.get("/{pool_name}/vdevs/data", response_class=JSONResponse)
-async def vdev_management_data(request: Request, pool_name: str):
+async def vdev_management_data(request: Request, pool_name: PoolName):
     """Return topology and disk data as JSON for async page loading"""
     try:
         topology = pool_service.get_pool_topology(pool_name)
@@ -1071,7 +1180,7 @@ async def vdev_management_data(request: Request, pool_name: str):
 @router.post("/{pool_name}/vdevs/acknowledge", response_class=JSONResponse)
 async def acknowledge_vdev_warning(
     request: Request,
-    pool_name: str,
+    pool_name: PoolName,
     current_user: str = Depends(get_current_user)
 ):
     """Log that the user acknowledged the VDev management data loss warning"""
@@ -1080,7 +1189,7 @@ async def acknowledge_vdev_warning(
 
 
 @router.get("/{pool_name}/vdevs/check-disk-usage", response_class=JSONResponse)
-async def vdev_check_disk_usage(request: Request, pool_name: str):
+async def vdev_check_disk_usage(request: Request, pool_name: PoolName):
     """Check disk usage status for vdev management page"""
     try:
         disk_status = disk_service.check_disk_usage_status()
@@ -1098,7 +1207,7 @@ async def vdev_check_disk_usage(request: Request, pool_name: str):
 @router.post("/{pool_name}/vdevs/add", response_class=HTMLResponse)
 async def add_vdev(
     request: Request,
-    pool_name: str,
+    pool_name: PoolName,
     vdev_type: Annotated[str, Form()],
     devices: Annotated[str, Form()],
     vdev_layout: Annotated[str, Form()] = "stripe",
@@ -1148,29 +1257,25 @@ async def add_vdev(
         vdevs.extend(device_list)
 
         pool_service.add_vdev(pool_name, vdevs, force=force)
+        _invalidate_pool_status(pool_name)
+        _clear_disk_cache()
         audit_logger.log_pool_vdev_add(
             user=current_user, pool_name=pool_name,
             vdevs=','.join(vdevs)
         )
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}/vdevs?message=VDev added successfully",
-            status_code=303
-        )
+        return redirect_to(f"/zfs/pools/{pool_name}/vdevs", message="VDev added successfully")
     except Exception as e:
         audit_logger.log_pool_vdev_add(
             user=current_user, pool_name=pool_name,
             vdevs=devices, success=False, error=str(e)
         )
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}/vdevs?error={str(e)}",
-            status_code=303
-        )
+        return redirect_to(f"/zfs/pools/{pool_name}/vdevs", error=str(e))
 
 
 @router.post("/{pool_name}/vdevs/attach", response_class=HTMLResponse)
 async def attach_device(
     request: Request,
-    pool_name: str,
+    pool_name: PoolName,
     existing_device: Annotated[str, Form()],
     new_device: Annotated[str, Form()],
     force: Annotated[bool, Form()] = False,
@@ -1209,16 +1314,15 @@ async def attach_device(
             pool_name, existing_clean,
             new_clean, force=force
         )
+        _invalidate_pool_status(pool_name)
+        _clear_disk_cache()
 
         audit_logger.log_pool_vdev_attach(
             user=current_user, pool_name=pool_name,
             existing_device=existing_device.strip(),
             new_device=new_device.strip()
         )
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}/vdevs?message=Device attached successfully. Resilvering will begin.",
-            status_code=303
-        )
+        return redirect_to(f"/zfs/pools/{pool_name}/vdevs", message="Device attached successfully. Resilvering will begin.")
     except Exception as e:
         audit_logger.log_pool_vdev_attach(
             user=current_user, pool_name=pool_name,
@@ -1226,46 +1330,39 @@ async def attach_device(
             new_device=new_device.strip(),
             success=False, error=str(e)
         )
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}/vdevs?error={str(e)}",
-            status_code=303
-        )
+        return redirect_to(f"/zfs/pools/{pool_name}/vdevs", error=str(e))
 
 
 @router.post("/{pool_name}/vdevs/detach", response_class=HTMLResponse)
 async def detach_device(
     request: Request,
-    pool_name: str,
+    pool_name: PoolName,
     device: Annotated[str, Form()],
     current_user: str = Depends(get_current_user)
 ):
     """Detach a device from a mirror"""
     try:
         pool_service.detach_device(pool_name, device.strip())
+        _invalidate_pool_status(pool_name)
+        _clear_disk_cache()
         audit_logger.log_pool_vdev_detach(
             user=current_user, pool_name=pool_name,
             device=device.strip()
         )
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}/vdevs?message=Device detached successfully",
-            status_code=303
-        )
+        return redirect_to(f"/zfs/pools/{pool_name}/vdevs", message="Device detached successfully")
     except Exception as e:
         audit_logger.log_pool_vdev_detach(
             user=current_user, pool_name=pool_name,
             device=device.strip(),
             success=False, error=str(e)
         )
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}/vdevs?error={str(e)}",
-            status_code=303
-        )
+        return redirect_to(f"/zfs/pools/{pool_name}/vdevs", error=str(e))
 
 
 @router.post("/{pool_name}/vdevs/replace", response_class=HTMLResponse)
 async def replace_device(
     request: Request,
-    pool_name: str,
+    pool_name: PoolName,
     old_device: Annotated[str, Form()],
     new_device: Annotated[str, Form()],
     force: Annotated[bool, Form()] = False,
@@ -1319,16 +1416,15 @@ async def replace_device(
             pool_name, old_clean,
             new_clean, force=force
         )
+        _invalidate_pool_status(pool_name)
+        _clear_disk_cache()
 
         audit_logger.log_pool_vdev_replace(
             user=current_user, pool_name=pool_name,
             old_device=old_device.strip(),
             new_device=new_device.strip()
         )
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}/vdevs?message=Device replacement started. Monitor resilvering progress on this page.",
-            status_code=303
-        )
+        return redirect_to(f"/zfs/pools/{pool_name}/vdevs", message="Device replacement started. Monitor resilvering progress on this page.")
     except Exception as e:
         audit_logger.log_pool_vdev_replace(
             user=current_user, pool_name=pool_name,
@@ -1336,46 +1432,39 @@ async def replace_device(
             new_device=new_device.strip(),
             success=False, error=str(e)
         )
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}/vdevs?error={str(e)}",
-            status_code=303
-        )
+        return redirect_to(f"/zfs/pools/{pool_name}/vdevs", error=str(e))
 
 
 @router.post("/{pool_name}/vdevs/remove", response_class=HTMLResponse)
 async def remove_vdev(
     request: Request,
-    pool_name: str,
+    pool_name: PoolName,
     device: Annotated[str, Form()],
     current_user: str = Depends(get_current_user)
 ):
     """Remove a vdev from the pool"""
     try:
         pool_service.remove_vdev(pool_name, device.strip())
+        _invalidate_pool_status(pool_name)
+        _clear_disk_cache()
         audit_logger.log_pool_vdev_remove(
             user=current_user, pool_name=pool_name,
             device=device.strip()
         )
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}/vdevs?message=VDev removal initiated",
-            status_code=303
-        )
+        return redirect_to(f"/zfs/pools/{pool_name}/vdevs", message="VDev removal initiated")
     except Exception as e:
         audit_logger.log_pool_vdev_remove(
             user=current_user, pool_name=pool_name,
             device=device.strip(),
             success=False, error=str(e)
         )
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}/vdevs?error={str(e)}",
-            status_code=303
-        )
+        return redirect_to(f"/zfs/pools/{pool_name}/vdevs", error=str(e))
 
 
 @router.post("/{pool_name}/vdevs/online", response_class=HTMLResponse)
 async def online_device(
     request: Request,
-    pool_name: str,
+    pool_name: PoolName,
     device: Annotated[str, Form()],
     expand: Annotated[bool, Form()] = False,
     current_user: str = Depends(get_current_user)
@@ -1383,30 +1472,25 @@ async def online_device(
     """Bring a device online"""
     try:
         pool_service.online_device(pool_name, device.strip(), expand=expand)
+        _invalidate_pool_status(pool_name)
         audit_logger.log_pool_device_online(
             user=current_user, pool_name=pool_name,
             device=device.strip(), expand=expand
         )
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}/vdevs?message=Device brought online successfully",
-            status_code=303
-        )
+        return redirect_to(f"/zfs/pools/{pool_name}/vdevs", message="Device brought online successfully")
     except Exception as e:
         audit_logger.log_pool_device_online(
             user=current_user, pool_name=pool_name,
             device=device.strip(), expand=expand,
             success=False, error=str(e)
         )
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}/vdevs?error={str(e)}",
-            status_code=303
-        )
+        return redirect_to(f"/zfs/pools/{pool_name}/vdevs", error=str(e))
 
 
 @router.post("/{pool_name}/vdevs/offline", response_class=HTMLResponse)
 async def offline_device(
     request: Request,
-    pool_name: str,
+    pool_name: PoolName,
     device: Annotated[str, Form()],
     temporary: Annotated[bool, Form()] = False,
     current_user: str = Depends(get_current_user)
@@ -1416,6 +1500,7 @@ async def offline_device(
         pool_service.offline_device(
             pool_name, device.strip(), temporary=temporary
         )
+        _invalidate_pool_status(pool_name)
         audit_logger.log_pool_device_offline(
             user=current_user, pool_name=pool_name,
             device=device.strip(), temporary=temporary
@@ -1423,26 +1508,20 @@ async def offline_device(
         msg = "Device taken offline"
         if temporary:
             msg += " (temporary, will auto-online on reboot)"
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}/vdevs?message={msg}",
-            status_code=303
-        )
+        return redirect_to(f"/zfs/pools/{pool_name}/vdevs", message=msg)
     except Exception as e:
         audit_logger.log_pool_device_offline(
             user=current_user, pool_name=pool_name,
             device=device.strip(), temporary=temporary,
             success=False, error=str(e)
         )
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}/vdevs?error={str(e)}",
-            status_code=303
-        )
+        return redirect_to(f"/zfs/pools/{pool_name}/vdevs", error=str(e))
 
 
 @router.post("/{pool_name}/reservation", response_class=HTMLResponse)
 async def set_pool_reservation(
     request: Request,
-    pool_name: str,
+    pool_name: PoolName,
     reservation_size: Annotated[str, Form()],
     current_user: str = Depends(get_current_user)
 ):
@@ -1457,21 +1536,15 @@ async def set_pool_reservation(
             value=value
         )
         msg = f"Reservation set to {value}" if value != 'none' else "Reservation removed"
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}?message={msg}",
-            status_code=303
-        )
+        return redirect_to(f"/zfs/pools/{pool_name}", message=msg)
     except Exception as e:
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}?error={str(e)}",
-            status_code=303
-        )
+        return redirect_to(f"/zfs/pools/{pool_name}", error=str(e))
 
 
 @router.post("/{pool_name}/mountpoint", response_class=HTMLResponse)
 async def set_pool_mountpoint(
     request: Request,
-    pool_name: str,
+    pool_name: PoolName,
     mountpoint: Annotated[str, Form()],
     current_user: str = Depends(get_current_user)
 ):
@@ -1503,11 +1576,11 @@ async def set_pool_mountpoint(
             pool=pool_name,
             value=value,
         )
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}?message=Mountpoint set to {value}. "
-                f"Child datasets that inherit the mountpoint property have been "
-                f"remounted under the new path.",
-            status_code=303,
+        return redirect_to(
+            f"/zfs/pools/{pool_name}",
+            message=f"Mountpoint set to {value}. "
+                    f"Child datasets that inherit the mountpoint property have been "
+                    f"remounted under the new path.",
         )
     except Exception as e:
         audit_logger.log_zfs_operation(
@@ -1518,7 +1591,4 @@ async def set_pool_mountpoint(
             success=False,
             error=str(e),
         )
-        return RedirectResponse(
-            url=f"/zfs/pools/{pool_name}?error={str(e)}",
-            status_code=303,
-        )
+        return redirect_to(f"/zfs/pools/{pool_name}", error=str(e))
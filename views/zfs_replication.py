@@ -2,12 +2,22 @@
 ZFS Replication Management Views
 Provides web interface for ZFS replication operations using native send/receive and syncoid
 """
+import asyncio
+import hashlib
+import html
 from fastapi import APIRouter, Request, Form, Depends, Body
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, Response
-from typing import Annotated, Optional, Dict
+from fastapi.responses import HTMLResponse, RedirectResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import Annotated, Any, Dict, List, Optional, Set, Tuple
 import platform
+import smtplib
+import subprocess
 import threading
+import time
+from jinja2 import TemplateNotFound
+from pydantic_core import to_json
 from config.templates import templates
+from config.responses import FastJSONResponse, redirect_to
 from services.zfs_replication import ZFSReplicationService, ReplicationType, CompressionMethod
 from services.syncoid import SyncoidService
 from services.zfs_dataset import ZFSDatasetService
@@ -24,46 +34,332 @@ dataset_service = ZFSDatasetService()
 snapshot_service = ZFSSnapshotService()
 ssh_service = SSHConnectionService()
 
+# Browser caching for the form pages, which change on a slow timescale
+_FORM_CACHE_CONTROL = "private, max-age=5, must-revalidate"
+
+# Upper bound in seconds on the notification test, which may need several
+# SMTP_TIMEOUT-bounded exchanges (connect, STARTTLS, login, send)
+_SMTP_TEST_TIMEOUT = 30.0
+
+# The in-flight notification test, shared by overlapping test requests
+_notification_test: Optional[asyncio.Task[Dict[str, Any]]] = None
+
+# Operating system name, shown by the index and syncoid pages
+_SYSTEM = platform.system()
+
+# Email settings shown by the notification settings page. The email service
+# reads them from the environment once at startup, so they never change
+# while the process runs.
+_NOTIFICATION_SETTINGS = {
+    "is_configured": replication_service.email.is_configured(),
+    "smtp_enabled": replication_service.email.smtp_enabled,
+    "smtp_host": replication_service.email.smtp_host,
+    "smtp_port": replication_service.email.smtp_port,
+    "smtp_from_address": replication_service.email.smtp_from_address,
+    "recipients": tuple(replication_service.email.notification_recipients),
+}
+
+# Form value -> enum member, and the values offered by the job and
+# send/receive forms
+_RTYPE_MAP = {t.value: t for t in ReplicationType}
+_COMP_MAP = {c.value: c for c in CompressionMethod}
+_REPLICATION_TYPES = tuple(_RTYPE_MAP)
+_COMPRESSION_METHODS = tuple(_COMP_MAP)
+
+# Remote dataset name lists for the replication forms, keyed by SSH
+# connection id: key -> (monotonic timestamp, names)
+_REMOTE_DATASETS_TTL = 15.0
+_datasets_cache: Dict[str, Tuple[float, List[str]]] = {}
+_datasets_cache_lock = threading.Lock()
+
+# Limits for the ssh 'zfs list' behind the remote dataset APIs
+_REMOTE_SSH_TIMEOUT = 30
+_DISCONNECT_POLL_INTERVAL = 1.0
+
+# Local datasets as (monotonic timestamp, datasets), shared by the dataset
+# API and the form error paths
+_LOCAL_DATASETS_TTL = 3.0
+_local_datasets_cache: Optional[Tuple[float, List[Dict[str, Any]]]] = None
+
+# Shared producer for the progress SSE stream. Each connected client gets a
+# queue in _progress_subscribers that receives new events as they appear;
+# _progress_snapshot holds the latest ones for clients that join later.
+_PROGRESS_INTERVAL = 2.0
+_PROGRESS_KEEPALIVE_INTERVAL = 15.0
+_ProgressItem = Tuple[bytes, bool]
+_progress_subscribers: Set[asyncio.Queue[_ProgressItem]] = set()
+_progress_producer: Optional[asyncio.Task[None]] = None
+_progress_snapshot: Optional[_ProgressItem] = None
+_SSE_KEEPALIVE = b'data: {"keepalive":true}\n\n'
+
+
+def _load_template(name: str):
+    """
+    Resolve a template once at import time.
+
+    With auto_reload enabled (DEBUG) the name is returned unchanged so that
+    template edits are still picked up on the next request. A template that
+    cannot be found is also left as a name, so the error surfaces when the
+    route is used rather than at startup.
+    """
+    if templates.env.auto_reload:
+        return name
+    try:
+        return templates.get_template(name)
+    except TemplateNotFound:
+        return name
+
+
+_TPL_COMMON_SNAPSHOTS = _load_template("zfs/replication/common_snapshots.jinja")
+_TPL_ESTIMATE_RESULT = _load_template("zfs/replication/estimate_result.jinja")
+_TPL_EXECUTION_DETAIL = _load_template("zfs/replication/execution_detail.jinja")
+_TPL_HISTORY = _load_template("zfs/replication/history.jinja")
+_TPL_INDEX = _load_template("zfs/replication/index.jinja")
+_TPL_JOB_CREATE = _load_template("zfs/replication/job_create.jinja")
+_TPL_JOB_DELETE_CONFIRM = _load_template("zfs/replication/job_delete_confirm.jinja")
+_TPL_JOB_DETAIL = _load_template("zfs/replication/job_detail.jinja")
+_TPL_NOTIFICATION_SETTINGS = _load_template("zfs/replication/notification_settings.jinja")
+_TPL_NOTIFICATION_TEST_RESULT = _load_template("zfs/replication/notification_test_result.jinja")
+_TPL_SEND_RECEIVE = _load_template("zfs/replication/send_receive.jinja")
+_TPL_SYNCOID = _load_template("zfs/replication/syncoid.jinja")
+_TPL_SYNCOID_RESULT = _load_template("zfs/replication/syncoid_result.jinja")
+
+
+_ERROR_MARKER = "\x00error\x00"
+
+
+def _split_error_partial() -> Tuple[str, str]:
+    """Render partials/error.jinja around a marker and split it there"""
+    rendered = templates.get_template("partials/error.jinja").render(error=_ERROR_MARKER)
+    prefix, suffix = rendered.split(_ERROR_MARKER)
+    return prefix, suffix
+
+
+_ERROR_PARTIAL = None if templates.env.auto_reload else _split_error_partial()
+
+
+def _error_response(error: str) -> HTMLResponse:
+    """
+    Return the error partial for error without a Jinja render.
+    
+    The partial's markup is fixed apart from the message, so it is rendered
+    once and only the escaped message is inserted per response.
+    """
+    prefix, suffix = _ERROR_PARTIAL or _split_error_partial()
+    return HTMLResponse(prefix + html.escape(error) + suffix)
+
+
+def _replication_type(value: str) -> ReplicationType:
+    """Map a submitted replication type to its enum member"""
+    try:
+        return _RTYPE_MAP[value]
+    except KeyError:
+        raise ValueError(
+            f"Invalid replication type '{value}', expected one of: "
+            f"{', '.join(_REPLICATION_TYPES)}"
+        ) from None
+
+
+def _compression_method(value: str) -> CompressionMethod:
+    """Map a submitted compression method to its enum member"""
+    try:
+        return _COMP_MAP[value]
+    except KeyError:
+        raise ValueError(
+            f"Invalid compression method '{value}', expected one of: "
+            f"{', '.join(_COMPRESSION_METHODS)}"
+        ) from None
+
+
+def _notification_test_done(task: asyncio.Task[Dict[str, Any]]) -> None:
+    """Let the next test request start a new notification test"""
+    global _notification_test
+    _notification_test = None
+    # Retrieve any exception so it is not reported as unhandled when every
+    # waiter has already given up on the test
+    if not task.cancelled():
+        task.exception()
+
+
+def _cacheable(request: Request, response: HTMLResponse) -> Response:
+    """
+    Let the browser reuse a rendered form page for a few seconds.
+    
+    Adds Cache-Control and an ETag of the rendered page, and answers with
+    a 304 when the browser already has that exact page.
+    """
+    etag = f'"{hashlib.blake2b(response.body, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": _FORM_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return response
+
+
+def _get_cached_dataset_names(key: str, ttl: float) -> Optional[List[str]]:
+    """Return cached dataset names for key if younger than ttl seconds"""
+    with _datasets_cache_lock:
+        cached = _datasets_cache.get(key)
+    if cached and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+    return None
+
+
+def _cache_dataset_names(key: str, names: List[str]) -> None:
+    """Store dataset names for key"""
+    with _datasets_cache_lock:
+        _datasets_cache[key] = (time.monotonic(), names)
+
+
+def _list_local_datasets(refresh: bool = False) -> List[Dict[str, Any]]:
+    """
+    Get local datasets, reusing a listing younger than _LOCAL_DATASETS_TTL.
+    
+    The form pages always refresh it; a failed form submission that
+    re-renders the form right after reuses it instead of repeating
+    'zfs list'.
+    """
+    global _local_datasets_cache
+    cached = _local_datasets_cache
+    if not refresh and cached and time.monotonic() - cached[0] < _LOCAL_DATASETS_TTL:
+        return cached[1]
+    datasets = dataset_service.list_datasets()
+    _local_datasets_cache = (time.monotonic(), datasets)
+    return datasets
+
+
+def _list_local_datasets_and_snapshots() -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Get fresh local datasets and snapshots from a single 'zfs list'.
+    
+    The datasets also refresh the _list_local_datasets() cache.
+    """
+    global _local_datasets_cache
+    datasets, snapshots = dataset_service.list_datasets_and_snapshots()
+    _local_datasets_cache = (time.monotonic(), datasets)
+    return datasets, snapshots
+
+
+async def _run_remote_zfs_list(
+    request: Request,
+    ssh_connection_id: str,
+    connection: Dict[str, Any],
+    *ssh_options: str,
+    multiplex: bool = True,
+) -> Optional[subprocess.CompletedProcess[str]]:
+    """
+    List a remote system's datasets over SSH using the connection's stored key.
+    
+    With multiplex, ssh reuses (or starts) the connection's shared master
+    connection. Without it, ssh always makes a connection of its own, so a
+    revoked key or changed host cannot be hidden by a master that is still
+    open.
+    
+    ssh runs as an asyncio subprocess, so no worker thread is held while it
+    runs. It is killed if it takes longer than _REMOTE_SSH_TIMEOUT seconds
+    (raising subprocess.TimeoutExpired), if the client disconnects
+    (returning None) or if the request is cancelled.
+    """
+    ssh_cmd = [
+        'ssh',
+        '-T',
+        '-i', connection['private_key_path'],
+        '-p', str(connection['port']),
+        '-o', 'StrictHostKeyChecking=no',
+        '-o', 'UserKnownHostsFile=/dev/null',
+        '-o', 'BatchMode=yes',
+        *ssh_options,
+        *(
+            ssh_service.get_control_master_args(ssh_connection_id)
+            if multiplex
+            else ['-o', 'ControlMaster=no', '-o', 'ControlPath=none']
+        ),
+        f"{connection['username']}@{connection['host']}",
+        'zfs', 'list', '-H', '-o', 'name'
+    ]
+    process = await asyncio.create_subprocess_exec(
+        *ssh_cmd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    communicate = asyncio.ensure_future(process.communicate())
+    deadline = time.monotonic() + _REMOTE_SSH_TIMEOUT
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired(ssh_cmd, _REMOTE_SSH_TIMEOUT)
+            done, _ = await asyncio.wait(
+                {communicate}, timeout=min(_DISCONNECT_POLL_INTERVAL, remaining)
+            )
+            if done:
+                stdout, stderr = communicate.result()
+                # communicate() only returns once ssh has exited
+                assert process.returncode is not None
+                # Dataset names are ASCII, so skip locale-aware decoding
+                return subprocess.CompletedProcess(
+                    ssh_cmd,
+                    process.returncode,
+                    stdout.decode('ascii', 'replace'),
+                    stderr.decode('utf-8', 'replace'),
+                )
+            if await request.is_disconnected():
+                return None
+    finally:
+        if process.returncode is None:
+            process.kill()
+            await asyncio.gather(communicate, return_exceptions=True)
+
+
+def _index_context(**overrides: Any) -> Dict[str, Any]:
+    """Build the replication dashboard context, defaulting to an empty page"""
+    return {
+        "jobs": [],
+        "syncoid_status": {'installed': False},
+        "active_executions": [],
+        "system": _SYSTEM,
+        "page_title": "ZFS Replication",
+        **overrides,
+    }
+
+
+def _syncoid_context(**overrides: Any) -> Dict[str, Any]:
+    """Build the syncoid page context, defaulting to an empty page"""
+    return {
+        "syncoid_status": {'installed': False},
+        "datasets": [],
+        "ssh_connections": [],
+        "system": _SYSTEM,
+        "page_title": "Syncoid Replication",
+        **overrides,
+    }
+
 
 @router.get("/", response_class=HTMLResponse)
 async def replication_index(request: Request):
     """Display replication management dashboard"""
     try:
-        # Get replication jobs
-        jobs = replication_service.list_replication_jobs()
-        
-        # Check syncoid status
-        syncoid_status = syncoid_service.check_syncoid_status()
-
-        # Get active executions so user can see in-progress replications
-        active_executions = replication_service.get_active_executions()
-        
-        # Detect OS
-        system = platform.system()
+        # Get replication jobs, syncoid status and active executions (so the
+        # user can see in-progress replications) concurrently
+        jobs, syncoid_status, active_executions = await asyncio.gather(
+            run_in_threadpool(replication_service.list_replication_jobs),
+            run_in_threadpool(syncoid_service.check_syncoid_status),
+            run_in_threadpool(replication_service.get_active_executions),
+        )
         
         return templates.TemplateResponse(
             request,
-            name="zfs/replication/index.jinja",
-            context={
-                "jobs": jobs,
-                "syncoid_status": syncoid_status,
-                "active_executions": active_executions,
-                "system": system,
-                "page_title": "ZFS Replication"
-            }
+            name=_TPL_INDEX,
+            context=_index_context(
+                jobs=jobs,
+                syncoid_status=syncoid_status,
+                active_executions=active_executions,
+            )
         )
     except Exception as e:
         return templates.TemplateResponse(
-            request,
-            name="zfs/replication/index.jinja",
-            context={
-                "jobs": [],
-                "syncoid_status": {'installed': False},
-                "active_executions": [],
-                "system": platform.system(),
-                "error": str(e),
-                "page_title": "ZFS Replication"
-            }
+            request, name=_TPL_INDEX, context=_index_context(error=str(e))
         )
 
 
@@ -71,25 +367,26 @@ async def replication_index(request: Request):
 async def create_job_form(request: Request):
     """Display create replication job form"""
     try:
-        # Get available datasets
-        datasets = dataset_service.list_datasets()
+        # Get available datasets (kept briefly for a failed submission)
+        datasets = _list_local_datasets(refresh=True)
         ssh_connections = ssh_service.list_connections()
         
-        return templates.TemplateResponse(
+        response = templates.TemplateResponse(
             request,
-            name="zfs/replication/job_create.jinja",
+            name=_TPL_JOB_CREATE,
             context={
                 "datasets": datasets,
                 "ssh_connections": ssh_connections,
-                "replication_types": [t.value for t in ReplicationType],
-                "compression_methods": [c.value for c in CompressionMethod],
+                "replication_types": _REPLICATION_TYPES,
+                "compression_methods": _COMPRESSION_METHODS,
                 "page_title": "Create Replication Job"
             }
         )
+        return _cacheable(request, response)
     except Exception as e:
         return templates.TemplateResponse(
             request,
-            name="zfs/replication/job_create.jinja",
+            name=_TPL_JOB_CREATE,
             context={
                 "datasets": [],
                 "ssh_connections": [],
@@ -138,11 +435,11 @@ async def create_job(
             name=name,
             source_dataset=source_dataset,
             target_dataset=target_dataset,
-            replication_type=ReplicationType(replication_type),
+            replication_type=_replication_type(replication_type),
             schedule=schedule,
             enabled=enabled,
             recursive=recursive,
-            compression=CompressionMethod(compression),
+            compression=_compression_method(compression),
             **options
         )
         
@@ -151,16 +448,16 @@ async def create_job(
             status_code=303
         )
     except Exception as e:
-        datasets = dataset_service.list_datasets()
+        datasets = _list_local_datasets()
         ssh_connections = ssh_service.list_connections()
         return templates.TemplateResponse(
             request,
-            name="zfs/replication/job_create.jinja",
+            name=_TPL_JOB_CREATE,
             context={
                 "datasets": datasets,
                 "ssh_connections": ssh_connections,
-                "replication_types": [t.value for t in ReplicationType],
-                "compression_methods": [c.value for c in CompressionMethod],
+                "replication_types": _REPLICATION_TYPES,
+                "compression_methods": _COMPRESSION_METHODS,
                 "error": str(e),
                 "page_title": "Create Replication Job"
             }
@@ -171,13 +468,15 @@ async def create_job(
 async def job_detail(request: Request, job_id: str):
     """Display replication job details"""
     try:
-        job = replication_service.get_replication_job(job_id)
-        status = replication_service.get_replication_status(job_id)
-        history = replication_service.get_replication_history(job_id=job_id, limit=20)
+        job, status, history = await asyncio.gather(
+            run_in_threadpool(replication_service.get_replication_job, job_id),
+            run_in_threadpool(replication_service.get_replication_status, job_id),
+            run_in_threadpool(replication_service.get_replication_history, job_id=job_id, limit=20),
+        )
         
         return templates.TemplateResponse(
             request,
-            name="zfs/replication/job_detail.jinja",
+            name=_TPL_JOB_DETAIL,
             context={
                 "job": job,
                 "status": status,
@@ -186,14 +485,7 @@ async def job_detail(request: Request, job_id: str):
             }
         )
     except Exception as e:
-        return templates.TemplateResponse(
-            request,
-            name="partials/error.jinja",
-            context={
-                "error": str(e),
-                "back_url": "/zfs/replication"
-            }
-        )
+        return _error_response(str(e))
 
 
 @router.post("/jobs/{job_id}/enable", response_class=HTMLResponse)
@@ -235,21 +527,14 @@ async def delete_job_confirm(request: Request, job_id: str):
         job = replication_service.get_replication_job(job_id)
         return templates.TemplateResponse(
             request,
-            name="zfs/replication/job_delete_confirm.jinja",
+            name=_TPL_JOB_DELETE_CONFIRM,
             context={
                 "job": job,
                 "page_title": f"Delete Replication Job: {job['name']}"
             }
         )
     except Exception as e:
-        return templates.TemplateResponse(
-            request,
-            name="partials/error.jinja",
-            context={
-                "error": str(e),
-                "back_url": "/zfs/replication"
-            }
-        )
+        return _error_response(str(e))
 
 
 @router.post("/jobs/{job_id}/delete", response_class=HTMLResponse)
@@ -274,31 +559,38 @@ async def delete_job(request: Request, job_id: str):
 async def send_receive_form(request: Request):
     """Display ZFS send/receive form"""
     try:
-        datasets = dataset_service.list_datasets()
-        snapshots = snapshot_service.list_snapshots()
-        ssh_connections = ssh_service.list_connections()
-        
         # Build version-aware man page URLs for zfs-send and zfs-receive
-        zfs_send_man_url = get_openzfs_man_page_section_url(8, "zfs-send.8")
-        zfs_receive_man_url = get_openzfs_man_page_section_url(8, "zfs-receive.8")
+        # alongside the dataset/snapshot and connection lookups
+        (
+            (datasets, snapshots),
+            ssh_connections,
+            zfs_send_man_url,
+            zfs_receive_man_url,
+        ) = await asyncio.gather(
+            run_in_threadpool(_list_local_datasets_and_snapshots),
+            run_in_threadpool(ssh_service.list_connections),
+            run_in_threadpool(get_openzfs_man_page_section_url, 8, "zfs-send.8"),
+            run_in_threadpool(get_openzfs_man_page_section_url, 8, "zfs-receive.8"),
+        )
         
-        return templates.TemplateResponse(
+        response = templates.TemplateResponse(
             request,
-            name="zfs/replication/send_receive.jinja",
+            name=_TPL_SEND_RECEIVE,
             context={
                 "datasets": datasets,
                 "snapshots": snapshots,
                 "ssh_connections": ssh_connections,
-                "compression_methods": [c.value for c in CompressionMethod],
+                "compression_methods": _COMPRESSION_METHODS,
                 "zfs_send_man_url": zfs_send_man_url,
                 "zfs_receive_man_url": zfs_receive_man_url,
                 "page_title": "ZFS Send/Receive"
             }
         )
+        return _cacheable(request, response)
     except Exception as e:
         return templates.TemplateResponse(
             request,
-            name="zfs/replication/send_receive.jinja",
+            name=_TPL_SEND_RECEIVE,
             context={
                 "datasets": [],
                 "snapshots": [],
@@ -350,8 +642,8 @@ async def send_receive_execute(
                     options['remote_host'] = f"{connection['username']}@{connection['host']}"
                     options['remote_port'] = connection['port']
         
-        rep_type = ReplicationType(replication_type)
-        comp_method = CompressionMethod(compression)
+        rep_type = _replication_type(replication_type)
+        comp_method = _compression_method(compression)
         job_name = f"Manual: {source} → {target}"
         
         # Run replication in a background thread so user gets immediate feedback
@@ -378,15 +670,15 @@ async def send_receive_execute(
             status_code=303
         )
     except Exception as e:
-        datasets = dataset_service.list_datasets()
+        datasets = _list_local_datasets()
         snapshots = snapshot_service.list_snapshots()
         return templates.TemplateResponse(
             request,
-            name="zfs/replication/send_receive.jinja",
+            name=_TPL_SEND_RECEIVE,
             context={
                 "datasets": datasets,
                 "snapshots": snapshots,
-                "compression_methods": [c.value for c in CompressionMethod],
+                "compression_methods": _COMPRESSION_METHODS,
                 "error": str(e),
                 "page_title": "ZFS Send/Receive"
             }
@@ -410,21 +702,14 @@ async def estimate_size(
         
         return templates.TemplateResponse(
             request,
-            name="zfs/replication/estimate_result.jinja",
+            name=_TPL_ESTIMATE_RESULT,
             context={
                 "estimate": estimate,
                 "page_title": "Transfer Size Estimate"
             }
         )
     except Exception as e:
-        return templates.TemplateResponse(
-            request,
-            name="partials/error.jinja",
-            context={
-                "error": str(e),
-                "back_url": "/zfs/replication/send-receive/form"
-            }
-        )
+        return _error_response(str(e))
 
 
 # Syncoid Operations
@@ -433,36 +718,25 @@ async def estimate_size(
 async def syncoid_index(request: Request):
     """Display syncoid operations dashboard"""
     try:
-        syncoid_status = syncoid_service.check_syncoid_status()
-        datasets = dataset_service.list_datasets()
-        ssh_connections = ssh_service.list_connections()
-        
-        # Detect OS
-        system = platform.system()
+        syncoid_status, datasets, ssh_connections = await asyncio.gather(
+            run_in_threadpool(syncoid_service.check_syncoid_status),
+            run_in_threadpool(_list_local_datasets, True),
+            run_in_threadpool(ssh_service.list_connections),
+        )
         
-        return templates.TemplateResponse(
+        response = templates.TemplateResponse(
             request,
-            name="zfs/replication/syncoid.jinja",
-            context={
-                "syncoid_status": syncoid_status,
-                "datasets": datasets,
-                "ssh_connections": ssh_connections,
-                "system": system,
-                "page_title": "Syncoid Replication"
-            }
+            name=_TPL_SYNCOID,
+            context=_syncoid_context(
+                syncoid_status=syncoid_status,
+                datasets=datasets,
+                ssh_connections=ssh_connections,
+            )
         )
+        return _cacheable(request, response)
     except Exception as e:
         return templates.TemplateResponse(
-            request,
-            name="zfs/replication/syncoid.jinja",
-            context={
-                "syncoid_status": {'installed': False},
-                "datasets": [],
-                "ssh_connections": [],
-                "system": platform.system(),
-                "error": str(e),
-                "page_title": "Syncoid Replication"
-            }
+            request, name=_TPL_SYNCOID, context=_syncoid_context(error=str(e))
         )
 
 
@@ -505,7 +779,7 @@ async def syncoid_execute(
         
         return templates.TemplateResponse(
             request,
-            name="zfs/replication/syncoid_result.jinja",
+            name=_TPL_SYNCOID_RESULT,
             context={
                 "result": result,
                 "page_title": "Syncoid Result"
@@ -513,16 +787,15 @@ async def syncoid_execute(
         )
     except Exception as e:
         syncoid_status = syncoid_service.check_syncoid_status()
-        datasets = dataset_service.list_datasets()
+        datasets = _list_local_datasets()
         return templates.TemplateResponse(
             request,
-            name="zfs/replication/syncoid.jinja",
-            context={
-                "syncoid_status": syncoid_status,
-                "datasets": datasets,
-                "error": str(e),
-                "page_title": "Syncoid Replication"
-            }
+            name=_TPL_SYNCOID,
+            context=_syncoid_context(
+                syncoid_status=syncoid_status,
+                datasets=datasets,
+                error=str(e),
+            )
         )
 
 
@@ -576,7 +849,7 @@ async def syncoid_common_snapshots(
         
         return templates.TemplateResponse(
             request,
-            name="zfs/replication/common_snapshots.jinja",
+            name=_TPL_COMMON_SNAPSHOTS,
             context={
                 "result": result,
                 "source": source,
@@ -585,26 +858,17 @@ async def syncoid_common_snapshots(
             }
         )
     except Exception as e:
-        return templates.TemplateResponse(
-            request,
-            name="partials/error.jinja",
-            context={
-                "error": str(e),
-                "back_url": "/zfs/replication/syncoid"
-            }
-        )
+        return _error_response(str(e))
 
 
-@router.post("/api/test-remote-connection")
-async def test_remote_connection(data: Dict = Body(...)):
+@router.post("/api/test-remote-connection", response_class=FastJSONResponse)
+async def test_remote_connection(request: Request, data: Dict = Body(...)):
     """API endpoint to test remote SSH connection and fetch datasets using SSH connection ID"""
     try:
-        import subprocess
-        
         ssh_connection_id = data.get('ssh_connection_id')
         
         if not ssh_connection_id:
-            return JSONResponse({
+            return FastJSONResponse({
                 "success": False,
                 "error": "SSH connection is required"
             })
@@ -612,34 +876,32 @@ async def test_remote_connection(data: Dict = Body(...)):
         # Get the SSH connection
         connection = ssh_service.get_connection(ssh_connection_id)
         if not connection:
-            return JSONResponse({
+            return FastJSONResponse({
                 "success": False,
                 "error": "SSH connection not found"
             })
         
         # Get list of datasets from remote using key-based authentication
         try:
-            # Build the SSH command using the stored key
-            ssh_cmd = [
-                'ssh',
-                '-i', connection['private_key_path'],
-                '-p', str(connection['port']),
-                '-o', 'StrictHostKeyChecking=no',
-                '-o', 'UserKnownHostsFile=/dev/null',
-                '-o', 'BatchMode=yes',
-                f"{connection['username']}@{connection['host']}",
-                'zfs', 'list', '-H', '-o', 'name'
-            ]
-            
-            process = subprocess.run(ssh_cmd, capture_output=True, text=True, timeout=30)
+            # An explicit test must prove the key and host still work, so
+            # it never rides on an existing master connection
+            process = await _run_remote_zfs_list(
+                request, ssh_connection_id, connection, multiplex=False
+            )
+            if process is None:
+                return FastJSONResponse({
+                    "success": False,
+                    "error": "Request cancelled"
+                })
             
             if process.returncode == 0:
-                datasets = [line.strip() for line in process.stdout.strip().split('\n') if line.strip()]
+                datasets = list(filter(None, map(str.strip, process.stdout.splitlines())))
+                _cache_dataset_names(ssh_connection_id, datasets)
                 
                 # Mark connection as used for replication
                 ssh_service.mark_connection_used(ssh_connection_id, 'replication')
                 
-                return JSONResponse({
+                return FastJSONResponse({
                     "success": True,
                     "datasets": datasets,
                     "message": f"Connected to {connection['name']} successfully",
@@ -653,56 +915,56 @@ async def test_remote_connection(data: Dict = Body(...)):
                 })
             else:
                 error_msg = process.stderr if process.stderr else "Connection failed"
-                return JSONResponse({
+                return FastJSONResponse({
                     "success": False,
                     "error": f"Failed to connect: {error_msg}"
                 })
         except subprocess.TimeoutExpired:
-            return JSONResponse({
+            return FastJSONResponse({
                 "success": False,
-                "error": "Connection timeout (30 seconds)"
+                "error": f"Connection timeout ({_REMOTE_SSH_TIMEOUT} seconds)"
             })
         except Exception as e:
-            return JSONResponse({
+            return FastJSONResponse({
                 "success": False,
                 "error": f"Failed to test connection: {str(e)}"
             })
             
     except Exception as e:
-        return JSONResponse({
+        return FastJSONResponse({
             "success": False,
             "error": str(e)
         })
 
 
-@router.get("/api/ssh-connections")
+@router.get("/api/ssh-connections", response_class=FastJSONResponse)
 async def get_ssh_connections():
     """API endpoint to get list of configured SSH connections"""
     try:
         connections = ssh_service.list_connections()
-        return JSONResponse({
+        return FastJSONResponse({
             "success": True,
             "connections": connections
         })
     except Exception as e:
-        return JSONResponse({
+        return FastJSONResponse({
             "success": False,
             "error": str(e)
         })
 
 
-@router.post("/api/get-remote-datasets")
-async def get_remote_datasets(data: Dict = Body(...)):
+@router.post("/api/get-remote-datasets", response_class=FastJSONResponse)
+async def get_remote_datasets(request: Request, data: Dict = Body(...)):
     """API endpoint to get datasets from a remote system via SSH connection"""
     try:
-        import subprocess
-        
         ssh_connection_id = data.get('ssh_connection_id')
+        # Pass "refresh": true to bypass the short-lived dataset cache
+        refresh = bool(data.get('refresh'))
         
         if not ssh_connection_id:
             # Return local datasets
-            local_datasets = dataset_service.list_datasets()
-            return JSONResponse({
+            local_datasets = _list_local_datasets(refresh=refresh)
+            return FastJSONResponse({
                 "success": True,
                 "datasets": [ds['name'] for ds in local_datasets],
                 "message": "Local datasets loaded",
@@ -712,31 +974,37 @@ async def get_remote_datasets(data: Dict = Body(...)):
         # Get the SSH connection
         connection = ssh_service.get_connection(ssh_connection_id)
         if not connection:
-            return JSONResponse({
+            return FastJSONResponse({
                 "success": False,
                 "error": "SSH connection not found"
             })
         
+        datasets = None if refresh else _get_cached_dataset_names(ssh_connection_id, _REMOTE_DATASETS_TTL)
+        if datasets is not None:
+            return FastJSONResponse({
+                "success": True,
+                "datasets": datasets,
+                "message": f"Loaded {len(datasets)} datasets from {connection['name']}",
+                "is_local": False,
+                "connection_name": connection['name']
+            })
+        
         # Get list of datasets from remote using key-based authentication
         try:
-            ssh_cmd = [
-                'ssh',
-                '-i', connection['private_key_path'],
-                '-p', str(connection['port']),
-                '-o', 'StrictHostKeyChecking=no',
-                '-o', 'UserKnownHostsFile=/dev/null',
-                '-o', 'BatchMode=yes',
-                '-o', 'ConnectTimeout=10',
-                f"{connection['username']}@{connection['host']}",
-                'zfs', 'list', '-H', '-o', 'name'
-            ]
-            
-            process = subprocess.run(ssh_cmd, capture_output=True, text=True, timeout=30)
+            process = await _run_remote_zfs_list(
+                request, ssh_connection_id, connection, '-o', 'ConnectTimeout=10'
+            )
+            if process is None:
+                return FastJSONResponse({
+                    "success": False,
+                    "error": "Request cancelled"
+                })
             
             if process.returncode == 0:
-                datasets = [line.strip() for line in process.stdout.strip().split('\n') if line.strip()]
+                datasets = list(filter(None, map(str.strip, process.stdout.splitlines())))
+                _cache_dataset_names(ssh_connection_id, datasets)
                 
-                return JSONResponse({
+                return FastJSONResponse({
                     "success": True,
                     "datasets": datasets,
                     "message": f"Loaded {len(datasets)} datasets from {connection['name']}",
@@ -745,23 +1013,23 @@ async def get_remote_datasets(data: Dict = Body(...)):
                 })
             else:
                 error_msg = process.stderr if process.stderr else "Connection failed"
-                return JSONResponse({
+                return FastJSONResponse({
                     "success": False,
                     "error": f"Failed to get datasets: {error_msg}"
                 })
         except subprocess.TimeoutExpired:
-            return JSONResponse({
+            return FastJSONResponse({
                 "success": False,
-                "error": "Connection timeout (30 seconds)"
+                "error": f"Connection timeout ({_REMOTE_SSH_TIMEOUT} seconds)"
             })
         except Exception as e:
-            return JSONResponse({
+            return FastJSONResponse({
                 "success": False,
                 "error": f"Failed to fetch datasets: {str(e)}"
             })
             
     except Exception as e:
-        return JSONResponse({
+        return FastJSONResponse({
             "success": False,
             "error": str(e)
         })
@@ -776,7 +1044,7 @@ async def replication_history(request: Request, limit: int = 50, offset: int = 0
         
         return templates.TemplateResponse(
             request,
-            name="zfs/replication/history.jinja",
+            name=_TPL_HISTORY,
             context={
                 "history": history,
                 "active_executions": active_executions,
@@ -788,7 +1056,7 @@ async def replication_history(request: Request, limit: int = 50, offset: int = 0
     except Exception as e:
         return templates.TemplateResponse(
             request,
-            name="zfs/replication/history.jinja",
+            name=_TPL_HISTORY,
             context={
                 "history": [],
                 "active_executions": [],
@@ -805,32 +1073,18 @@ async def execution_detail(request: Request, execution_id: int):
         execution = replication_service.get_execution_detail(execution_id)
         
         if not execution:
-            return templates.TemplateResponse(
-                request,
-                name="partials/error.jinja",
-                context={
-                    "error": f"Execution {execution_id} not found",
-                    "back_url": "/zfs/replication/history"
-                }
-            )
+            return _error_response(f"Execution {execution_id} not found")
         
         return templates.TemplateResponse(
             request,
-            name="zfs/replication/execution_detail.jinja",
+            name=_TPL_EXECUTION_DETAIL,
             context={
                 "execution": execution,
                 "page_title": f"Execution #{execution_id}"
             }
         )
     except Exception as e:
-        return templates.TemplateResponse(
-            request,
-            name="partials/error.jinja",
-            context={
-                "error": str(e),
-                "back_url": "/zfs/replication/history"
-            }
-        )
+        return _error_response(str(e))
 
 
 @router.post("/history/{execution_id}/mark-failed", response_class=HTMLResponse)
@@ -1016,52 +1270,119 @@ async def execution_error_log(request: Request, execution_id: int):
     )
 
 
+def _sse_frame(data: Dict[str, Any]) -> bytes:
+    """Encode one Server-Sent Events data frame"""
+    return b"data: " + to_json(data) + b"\n\n"
+
+
+def _collect_progress_events() -> bytes:
+    """Poll active executions once and encode the progress frames to send"""
+    active = replication_service.get_active_executions()
+    if not active:
+        # Send keepalive
+        return _SSE_KEEPALIVE
+    
+    # Get the latest progress of all active executions in one call
+    latest = replication_service.get_latest_progress_updates(
+        [execution['id'] for execution in active]
+    )
+    
+    frames = []
+    for execution in active:
+        latest_progress = latest.get(execution['id'])
+        if latest_progress:
+            frames.append(_sse_frame({
+                'execution_id': execution['id'],
+                'job_name': execution['job_name'],
+                'percentage': latest_progress.get('percentage_complete', 0),
+                'bytes_transferred': latest_progress.get('bytes_transferred', 0),
+                'transfer_rate': latest_progress.get('transfer_rate', 'N/A'),
+                'eta': latest_progress.get('estimated_time_remaining', 'N/A'),
+                'status': latest_progress.get('status_message', '')
+            }))
+    return b"".join(frames)
+
+
+def _publish_progress(item: _ProgressItem) -> None:
+    """Hand a (frames, failed) item to every subscribed SSE client"""
+    for queue in list(_progress_subscribers):
+        # A client that has not consumed the previous item only needs
+        # the newest one
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(item)
+
+
+async def _produce_progress() -> None:
+    """
+    Watch replication progress for all SSE subscribers.
+    
+    Runs only while at least one client is subscribed. Every interval it
+    only compares the storage's change marker; executions are re-read and
+    the frames encoded once, and only when something was written. While
+    nothing changes, subscribers get a keepalive every
+    _PROGRESS_KEEPALIVE_INTERVAL seconds. Each item is (frames, failed).
+    """
+    global _progress_snapshot
+    marker = None
+    last_sent = 0.0
+    while _progress_subscribers:
+        item = None
+        try:
+            current = replication_service.get_executions_marker()
+            if _progress_snapshot is None or current != marker:
+                marker = current
+                item = (await run_in_threadpool(_collect_progress_events), False)
+                _progress_snapshot = item
+            elif time.monotonic() - last_sent >= _PROGRESS_KEEPALIVE_INTERVAL:
+                item = (_SSE_KEEPALIVE, False)
+        except Exception as e:
+            item = (_sse_frame({'error': str(e)}), True)
+            _progress_snapshot = None
+        
+        if item:
+            _publish_progress(item)
+            last_sent = time.monotonic()
+        
+        await asyncio.sleep(_PROGRESS_INTERVAL)
+    _progress_snapshot = None
+
+
+def _subscribe_progress() -> asyncio.Queue[_ProgressItem]:
+    """Register an SSE client and make sure the shared producer is running"""
+    global _progress_producer
+    queue: asyncio.Queue[_ProgressItem] = asyncio.Queue(maxsize=1)
+    if _progress_snapshot:
+        # Show the current progress right away instead of waiting for the
+        # next change
+        queue.put_nowait(_progress_snapshot)
+    _progress_subscribers.add(queue)
+    if _progress_producer is None or _progress_producer.done():
+        _progress_producer = asyncio.create_task(_produce_progress())
+    return queue
+
+
 @router.get("/api/progress-stream")
 async def progress_stream(request: Request):
     """Server-Sent Events endpoint for real-time progress monitoring"""
-    from fastapi.responses import StreamingResponse
-    import asyncio
     
     async def event_generator():
         """Generate SSE events for active replication progress"""
+        queue = _subscribe_progress()
         try:
             while True:
+                frames, failed = await queue.get()
+                
                 # Check if client disconnected
                 if await request.is_disconnected():
                     break
                 
-                # Get active executions
-                active = replication_service.get_active_executions()
-                
-                if active:
-                    # Send progress updates for each active execution
-                    for execution in active:
-                        # Get latest progress details
-                        detail = replication_service.get_execution_detail(execution['id'])
-                        if detail and detail.get('progress_updates'):
-                            latest_progress = detail['progress_updates'][-1]
-                            
-                            data = {
-                                'execution_id': execution['id'],
-                                'job_name': execution['job_name'],
-                                'percentage': latest_progress.get('percentage_complete', 0),
-                                'bytes_transferred': latest_progress.get('bytes_transferred', 0),
-                                'transfer_rate': latest_progress.get('transfer_rate', 'N/A'),
-                                'eta': latest_progress.get('estimated_time_remaining', 'N/A'),
-                                'status': latest_progress.get('status_message', '')
-                            }
-                            
-                            yield f"data: {json.dumps(data)}\n\n"
-                else:
-                    # Send keepalive
-                    yield f"data: {json.dumps({'keepalive': True})}\n\n"
-                
-                # Wait before next update (update every 2 seconds)
-                await asyncio.sleep(2)
-                
-        except Exception as e:
-            # Send error event
-            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+                if frames:
+                    yield frames
+                if failed:
+                    break
+        finally:
+            _progress_subscribers.discard(queue)
     
     return StreamingResponse(
         event_generator(),
@@ -1077,53 +1398,60 @@ async def progress_stream(request: Request):
 @router.get("/notifications/settings", response_class=HTMLResponse)
 async def notification_settings(request: Request):
     """Display email notification settings"""
-    try:
-        email_service = replication_service.email
-        is_configured = email_service.is_configured()
-        
-        return templates.TemplateResponse(
-            request,
-            name="zfs/replication/notification_settings.jinja",
-            context={
-                "is_configured": is_configured,
-                "smtp_enabled": email_service.smtp_enabled,
-                "smtp_host": email_service.smtp_host,
-                "smtp_port": email_service.smtp_port,
-                "smtp_from_address": email_service.smtp_from_address,
-                "recipients": email_service.notification_recipients,
-                "page_title": "Notification Settings"
-            }
-        )
-    except Exception as e:
-        return templates.TemplateResponse(
-            request,
-            name="zfs/replication/notification_settings.jinja",
-            context={
-                "is_configured": False,
-                "error": str(e),
-                "page_title": "Notification Settings"
-            }
-        )
+    # The context is a fixed snapshot, so only the template itself can fail,
+    # and an error page built from the same template would fail as well
+    response = templates.TemplateResponse(
+        request,
+        name=_TPL_NOTIFICATION_SETTINGS,
+        context={
+            **_NOTIFICATION_SETTINGS,
+            "page_title": "Notification Settings"
+        }
+    )
+    return _cacheable(request, response)
 
 
 @router.post("/notifications/test", response_class=HTMLResponse)
 async def test_notifications(request: Request):
     """Test email notification configuration"""
-    try:
-        email_service = replication_service.email
-        result = email_service.test_configuration()
-        
-        if result['status'] == 'sent':
-            message = "Test email sent successfully!"
-        else:
-            message = f"Failed to send test email: {result['message']}"
-        
-        return RedirectResponse(
-            url=f"/zfs/replication/notifications/settings?message={message}",
-            status_code=303
+    # The SMTP exchange blocks, so keep it off the event loop. Requests
+    # that arrive while a test is running (e.g. a double-click) wait for
+    # that test's result instead of sending another email.
+    global _notification_test
+    if _notification_test is None:
+        _notification_test = asyncio.ensure_future(
+            run_in_threadpool(replication_service.email.test_configuration)
         )
-    except Exception as e:
-        return RedirectResponse(
-            url=f"/zfs/replication/notifications/settings?error={str(e)}",
-            status_code=303
+        _notification_test.add_done_callback(_notification_test_done)
+    test = _notification_test
+    message = error = None
+    # asyncio.wait does not cancel the shared test when this request gives
+    # up on it, and unlike wait_for it reports the deadline separately
+    # from the test's own errors (an smtplib socket timeout is also a
+    # TimeoutError)
+    done, _ = await asyncio.wait({test}, timeout=_SMTP_TEST_TIMEOUT)
+    if not done:
+        error = f"SMTP server did not respond within {_SMTP_TEST_TIMEOUT:.0f} seconds"
+    else:
+        try:
+            result = test.result()
+        except (smtplib.SMTPException, OSError) as e:
+            # test_configuration raises send failures instead of returning them
+            error = f"Failed to send test email: {e}"
+        else:
+            if result['status'] == 'sent':
+                message = "Test email sent successfully!"
+            else:
+                error = f"Failed to send test email: {result['message']}"
+    
+    # The settings page posts via HTMX and only needs the outcome; plain
+    # form posts still get the full page through a redirect
+    if request.headers.get("HX-Request"):
+        return templates.TemplateResponse(
+            request,
+            name=_TPL_NOTIFICATION_TEST_RESULT,
+            context={"message": message, "error": error}
         )
+    return redirect_to(
+        "/zfs/replication/notifications/settings", message=message, error=error
+    )